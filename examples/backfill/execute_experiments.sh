@@ -1,5 +1 @@
-
-for job in test pack; do
-   mkdir -p $job
-   irmasim  --output_dir $job -w workload_$job.json options.json
-done
+irmasim-sweep --output_dir . options.json sweep.json
@@ -1,5 +1 @@
-
-for job in heuristic energy; do
-   mkdir -p $job
-   irmasim  --output_dir $job -w workload.json options_$job.json
-done
+irmasim-sweep --output_dir . options_heuristic.json sweep.json
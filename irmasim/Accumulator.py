@@ -0,0 +1,92 @@
+import math
+
+
+class Quantile:
+    """ Streaming quantile with a bounded relative error, from a histogram of logarithmic buckets (DDSketch, Masson
+    et al., 2019). The value is within accuracy times the exact quantile whatever the order of the values, and
+    quantiles of the same accuracy can be merged. """
+
+    def __init__(self, quantile: float, accuracy: float = 0.01):
+        self.quantile = quantile
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.count = 0
+        self.zeros = 0
+        # Counts of the values in (gamma^(key-1), gamma^key], negative values are counted by their magnitude
+        self.positive = {}
+        self.negative = {}
+
+    def add(self, value: float):
+        self.count += 1
+        if value > 0:
+            buckets = self.positive
+        elif value < 0:
+            buckets = self.negative
+            value = -value
+        else:
+            self.zeros += 1
+            return
+        key = math.inf if value == math.inf else math.ceil(math.log(value) / self.log_gamma)
+        buckets[key] = buckets.get(key, 0) + 1
+
+    def merge(self, other: 'Quantile'):
+        if other.accuracy != self.accuracy:
+            raise Exception("Only quantiles of the same accuracy can be merged")
+        self.count += other.count
+        self.zeros += other.zeros
+        for buckets, others in [(self.positive, other.positive), (self.negative, other.negative)]:
+            for key, count in others.items():
+                buckets[key] = buckets.get(key, 0) + count
+
+    def value(self):
+        if self.count == 0:
+            return math.nan
+        rank = self.quantile * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self.bucket_value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self.bucket_value(key)
+        return self.bucket_value(max(self.positive))
+
+    def bucket_value(self, key: float):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+
+class Accumulator:
+    """ Running count, total, minimum, maximum and, optionally, quantiles of a statistic within a relative error
+    of accuracy. """
+
+    def __init__(self, quantiles: list = [], accuracy: float = 0.01):
+        self.count = 0
+        self.total = 0.0
+        self.max = float(-math.inf)
+        self.min = float(math.inf)
+        self.quantiles = [Quantile(quantile, accuracy) for quantile in quantiles]
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+        for quantile in self.quantiles:
+            quantile.add(value)
+
+    def avg(self):
+        return self.total / max(self.count, 1)
+
+    def statistics(self) -> dict:
+        statistics = {"total": self.total, "avg": self.avg(), "max": self.max, "min": self.min}
+        for quantile in self.quantiles:
+            statistics["p" + format(quantile.quantile * 100, "g")] = quantile.value()
+        return statistics
@@ -0,0 +1,149 @@
+import io
+import marshal
+import math
+import os
+import os.path as path
+import pickle
+import random as rnd
+import sys
+import types
+import importlib
+import numpy
+from irmasim.JobQueue import JobQueue
+from irmasim.Simulator import Simulator
+
+
+def function(module: str, code: bytes):
+    return types.FunctionType(marshal.loads(code), importlib.import_module(module).__dict__)
+
+
+class SimulatorPickler(pickle.Pickler):
+    """ Writes the state of a simulator. The objects that do not change while simulating are not written, the
+    pickle refers to them by their index as persistent ids. Another simulator built with the same options gives
+    them back in the same order. The objects that the workload manager shares with forks and the generator of the
+    events are not written either, they are built again when resuming. Neither are the jobs waiting to arrive,
+    which are read again from the workload. """
+
+    def __init__(self, file, simulator: Simulator):
+        super(SimulatorPickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.job_queue = simulator.job_queue
+        self.omitted = unique([simulator.steps] + simulator.workload_manager.shared_objects(),
+                              static_objects(simulator))
+        self.persistent = { id(obj): index for index, obj in enumerate(static_objects(simulator) + self.omitted) }
+
+    def persistent_id(self, obj):
+        return self.persistent.get(id(obj))
+
+    def reducer_override(self, obj):
+        # Selection criteria are given as lambdas, which pickle cannot find by name
+        if type(obj) is types.FunctionType and obj.__closure__ is None and '<lambda>' in obj.__qualname__:
+            return function, (obj.__module__, marshal.dumps(obj.__code__))
+        if obj is self.job_queue:
+            return JobQueue.from_checkpoint, (obj.checkpoint_state(),)
+        return NotImplemented
+
+
+class SimulatorUnpickler(pickle.Unpickler):
+    """ Reads the state written by SimulatorPickler. """
+
+    def __init__(self, file, simulator: Simulator, omitted: int):
+        super(SimulatorUnpickler, self).__init__(file)
+        self.persistent = static_objects(simulator) + [None] * omitted
+
+    def persistent_load(self, index: int):
+        return self.persistent[index]
+
+
+def static_objects(simulator: Simulator) -> list:
+    return unique(simulator.static_objects() + [simulator.options])
+
+
+def unique(objects: list, excluded: list = []) -> list:
+    seen = set(id(obj) for obj in excluded)
+    seen.add(id(None))
+    result = []
+    for obj in objects:
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            result.append(obj)
+    return result
+
+
+class Checkpoint:
+    """ Snapshots of the simulations launched from the command line, so that an interrupted simulation can be
+    resumed from the last one.
+
+    A snapshot holds the state of the simulator, with its job queue, platform and workload manager, the random
+    generators of the process and the size of the logs at that point. It is written every checkpoint_interval
+    simulated seconds or every checkpoint_events events, and at the end of every run once its statistics have
+    been printed. """
+
+    VERSION = 2
+
+    def __init__(self, options: dict, logs: list):
+        self.file = options.get('checkpoint_file', path.join(options['output_dir'], 'checkpoint.pkl'))
+        self.interval = float(options.get('checkpoint_interval', math.inf))
+        self.events = float(options.get('checkpoint_events', math.inf))
+        self.output_dir = options['output_dir']
+        self.logs = logs
+
+    def exists(self) -> bool:
+        return path.isfile(self.file)
+
+    def simulate(self, run: int, simulator: Simulator):
+        next_time = simulator.simulation_time + self.interval
+        events = 0
+        while simulator.next_event():
+            events += 1
+            if events >= self.events or simulator.simulation_time >= next_time:
+                self.save(run, simulator)
+                next_time = simulator.simulation_time + self.interval
+                events = 0
+
+    def save(self, run: int, simulator: Simulator = None):
+        state = { 'version': self.VERSION, 'run': run, 'simulator': None, 'logs': {},
+                  'random': rnd.getstate(), 'numpy_random': numpy.random.get_state() }
+        if 'torch' in sys.modules:
+            state['torch_random'] = sys.modules['torch'].get_rng_state()
+        for log in self.logs:
+            log_file = path.join(self.output_dir, log)
+            state['logs'][log] = path.getsize(log_file) if path.isfile(log_file) else None
+        if simulator is not None:
+            buffer = io.BytesIO()
+            pickler = SimulatorPickler(buffer, simulator)
+            pickler.dump(simulator)
+            state['simulator'] = buffer.getvalue()
+            state['omitted'] = len(pickler.omitted)
+        # A checkpoint is replaced only once the new one is complete
+        with open(self.file + '.tmp', 'wb') as out_f:
+            pickle.dump(state, out_f, pickle.HIGHEST_PROTOCOL)
+        os.replace(self.file + '.tmp', self.file)
+
+    def restore(self, options: dict):
+        """ Cuts the logs back to their size in the checkpoint and rebuilds its simulator, if it was in the middle of
+        a run. Returns the run to go on with and the simulator, None to start that run. """
+        with open(self.file, 'rb') as in_f:
+            state = pickle.load(in_f)
+        if state['version'] != self.VERSION:
+            raise Exception(f"Checkpoint {self.file} was written by another version of IRMaSim")
+        print(f"Resuming from checkpoint {self.file} in run {state['run']}")
+        for log, size in state['logs'].items():
+            log_file = path.join(self.output_dir, log)
+            if size is None:
+                if path.isfile(log_file):
+                    os.remove(log_file)
+            else:
+                with open(log_file, 'r+b') as log_f:
+                    log_f.truncate(size)
+        simulator = None
+        if state['simulator'] is not None:
+            simulator = Simulator(options=options, run=state['run'])
+            simulator.load_workload()
+            simulator = SimulatorUnpickler(io.BytesIO(state['simulator']), simulator, state['omitted']).load()
+            simulator.workload_manager.on_resume()
+            simulator.resume_steps()
+        rnd.setstate(state['random'])
+        numpy.random.set_state(state['numpy_random'])
+        if 'torch_random' in state:
+            importlib.import_module('torch').set_rng_state(state['torch_random'])
+        return state['run'], simulator
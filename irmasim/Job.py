@@ -3,9 +3,13 @@ from irmasim.Task import Task
 
 
 class Job:
+    """ The tasks of a job are only created when they are first needed, usually when the job is scheduled. """
+
+    __slots__ = ('_tasks', 'id', 'rand', 'name', 'type', 'profile', 'submit_time', 'start_time', 'finish_time',
+                 'nodes', 'ntasks', 'ntasks_per_node', 'ops', 'opc', 'req_time', 'req_energy', 'memory', 'memory_vol')
 
     def __init__(self, id: int, name: str, submit_time: float, nodes: int, ntasks: int, ntasks_per_node: int, req_ops : int, ipc : float, req_time : float, req_energy : int, mem : int, mem_vol : float):
-        self.tasks = None
+        self._tasks = None
         self.id = id
         self.rand = 0
         self.name = str(name)
@@ -29,7 +33,6 @@ class Job:
         self.req_energy = req_energy
         self.memory = mem
         self.memory_vol = mem_vol
-        self.generate_tasks()
 
     @classmethod
     def from_profile(klass, id: int, name: str, submit_time: float, nodes: int, ntasks: int, ntasks_per_node: int, profile: dict, type: str):
@@ -55,13 +58,19 @@ class Job:
         self.profile = profile
         return self
     
+    @property
+    def tasks(self):
+        if self._tasks is None:
+            self.generate_tasks()
+        return self._tasks
+
     def is_job_finished(self):
         return sum([1 for task in self.tasks if task.ops > 0.0]) == 0
 
     def generate_tasks(self):
-        self.tasks = []
+        self._tasks = []
         for task in range(self.ntasks):
-            self.tasks.append(Task(self, self.ops, self.opc, self.memory, self.memory_vol))
+            self._tasks.append(Task(self, self.ops, self.opc, self.memory, self.memory_vol))
 
     def set_start_time(self, time: float):
         if self.start_time > time:
@@ -75,6 +84,9 @@ class Job:
             return False
         return self.id == other.id
 
+    def __hash__(self):
+        return hash(self.id)
+
     def task_strs(self):
         task_id = 0 
         task_strings = []
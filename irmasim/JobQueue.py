@@ -1,28 +1,74 @@
 from irmasim.Job import Job
+from irmasim.JobRecord import JobRecord
+from irmasim.JobSource import JobSource
+from sortedcontainers import SortedKeyList
+import collections
+import copy
 import math
 import logging
 import numpy
 
 class JobQueue:
 
-    def __init__(self):
-        self.future_jobs = []
-        self.submitted_jobs = []
-        self.finished_jobs = []
+    def __init__(self, finished_window: int = None, record: bool = False):
+        # Jobs waiting for their submit time, the front of the list is the next arrival
+        self.future_jobs = SortedKeyList(key=lambda job: job.submit_time)
+        # Submitted jobs map to their submission sequence, running jobs also keep their unfinished task count
+        self.pending_jobs = {}
+        self.running_jobs = {}
+        # Running jobs with all their tasks completed, they finish in the next step of the platform
+        self.completed_jobs = []
+        # With a window only the last finished jobs are kept, the older ones can be summarised by a record
+        self.finished_jobs = [] if finished_window is None else collections.deque(maxlen=int(finished_window))
+        self.finished_count = 0
+        self.finished_record = JobRecord() if record else None
+        self.sequence = 0
+        self.job_source = iter([])
+        self.next_source_job = None
+        self.source_jobs = 0
+        self.window = math.inf
+        self.arrival_time = -math.inf
 
     def add_job(self, job: Job):
-        self.future_jobs.append(job)
-        self.future_jobs.sort(key=lambda x: x.submit_time)
+        self.future_jobs.add(job)
 
     def add_jobs(self, jobs: list):
-        self.future_jobs.extend(jobs)
-        self.future_jobs.sort(key=lambda x: x.submit_time)
+        # A single stable sort, linear when the jobs already come in submit order
+        self.future_jobs.update(jobs)
+
+    def add_job_source(self, jobs, length: int, window: float = math.inf):
+        # Jobs are built from the iterator only when their submit time comes within the window of the current time
+        self.job_source = iter(jobs)
+        self.source_jobs = length
+        self.window = window
+        self.next_source_job = next(self.job_source, None)
+        if self.next_source_job is not None:
+            self.pull_jobs(self.next_source_job.submit_time)
+
+    def pull_jobs(self, now: float):
+        jobs = []
+        while self.next_source_job is not None and (self.next_source_job.submit_time <= now + self.window or
+                                                    not (self.future_jobs or jobs)):
+            job = self.next_source_job
+            if job.submit_time < self.arrival_time:
+                raise Exception(f"Job {job.name} arrives at {job.submit_time} after jobs arriving at "
+                                f"{self.arrival_time}, increase workload_window or sort the workload by subtime")
+            jobs.append(job)
+            self.next_source_job = next(self.job_source, None)
+        self.source_jobs -= len(jobs)
+        self.add_jobs(jobs)
 
     def get_next_jobs(self, now: float):
         if len(self.future_jobs) > 0:
-            incoming_jobs = [job for job in self.future_jobs if job.submit_time <= now]
-            self.submitted_jobs.extend(incoming_jobs)
-            self.future_jobs = [job for job in self.future_jobs if job not in incoming_jobs]
+            self.pull_jobs(now)
+            incoming_jobs = []
+            while self.future_jobs and self.future_jobs[0].submit_time <= now:
+                job = self.future_jobs.pop(0)
+                self.pending_jobs[job] = self.sequence
+                self.sequence += 1
+                incoming_jobs.append(job)
+            self.arrival_time = now
+            self.pull_jobs(now)
             return incoming_jobs
         else:
             raise Exception("No jobs in queue")
@@ -33,19 +79,75 @@ class JobQueue:
         else:
             return math.inf
 
+    def start_job(self, job: Job):
+        if job in self.pending_jobs:
+            self.running_jobs[job] = [self.pending_jobs.pop(job), job.ntasks]
+
+    def complete_tasks(self, tasks: list):
+        for task in tasks:
+            state = self.running_jobs[task.job]
+            state[1] -= 1
+            if state[1] == 0:
+                self.completed_jobs.append(task.job)
+
     def finish_jobs(self):
-        finishing_jobs = [job for job in self.submitted_jobs if job.is_job_finished()]
+        finishing_jobs = self.completed_jobs
+        self.completed_jobs = []
+        # Jobs finishing in the same step are reported in submission order
+        finishing_jobs.sort(key=lambda job: self.running_jobs[job][0])
+        for job in finishing_jobs:
+            del self.running_jobs[job]
         self.finished_jobs.extend(finishing_jobs)
-        self.submitted_jobs = [job for job in self.submitted_jobs if job not in finishing_jobs]
+        self.finished_count += len(finishing_jobs)
         return finishing_jobs
 
+    def record_jobs(self, jobs: list):
+        if self.finished_record is not None:
+            for job in jobs:
+                self.finished_record.add(job)
+
+    def checkpoint_state(self) -> dict:
+        """ The state of the queue without the jobs waiting to arrive, which are built again from the workload when
+        it is restored. Only the positions of the jobs already submitted since the first of those are kept. """
+        state = self.__dict__.copy()
+        waiting = [job.id for job in self.future_jobs]
+        if self.next_source_job is not None:
+            waiting.append(self.next_source_job.id)
+        if not waiting or not isinstance(self.job_source, JobSource):
+            return state
+        source = copy.copy(self.job_source)
+        source.records = None
+        source.position = min(waiting)
+        state['job_source'] = source
+        state['future_jobs'] = SortedKeyList(key=self.future_jobs.key)
+        state['next_source_job'] = None
+        state['rebuilt'] = (self.job_source.position, self.next_source_job is not None,
+                            sorted(set(range(source.position, self.job_source.position)) - set(waiting)))
+        return state
+
+    @classmethod
+    def from_checkpoint(klass, state: dict) -> 'JobQueue':
+        job_queue = klass.__new__(klass)
+        job_queue.__dict__.update(state)
+        if 'rebuilt' in state:
+            position, lookahead, submitted = job_queue.__dict__.pop('rebuilt')
+            submitted = set(submitted)
+            jobs = []
+            while job_queue.job_source.position < position:
+                job = next(job_queue.job_source)
+                if job.id not in submitted:
+                    jobs.append(job)
+            if lookahead:
+                job_queue.next_source_job = jobs.pop()
+            job_queue.future_jobs.update(jobs)
+        return job_queue
+
     def get_job_counts(self):
-        running  = sum([1 for job in self.submitted_jobs if job.start_time < math.inf])
-        return len(self.future_jobs), len(self.submitted_jobs) - running, running, len(self.finished_jobs)
+        return len(self.future_jobs) + self.source_jobs, len(self.pending_jobs), len(self.running_jobs), self.finished_count
 
 
     def __str__(self):
         return "future = [ " + ", ".join([str(job.id) for job in self.future_jobs]) + " ]" \
-            + " submitted = [ " + ", ".join([str(job.id) for job in self.submitted_jobs]) + " ]" \
+            + " pending = [ " + ", ".join([str(job.id) for job in self.pending_jobs]) + " ]" \
+            + " running = [ " + ", ".join([str(job.id) for job in self.running_jobs]) + " ]" \
             + " finished = [ " + ", ".join([str(job.id) for job in self.finished_jobs]) + " ]"
-
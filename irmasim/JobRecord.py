@@ -0,0 +1,28 @@
+from irmasim.Job import Job
+import numpy
+
+
+class JobRecord:
+    """ Compact record of finished jobs, one row of a NumPy structured array per job. It grows by doubling. """
+
+    DTYPE = numpy.dtype([('id', numpy.int64), ('submit_time', numpy.float64), ('start_time', numpy.float64),
+                         ('finish_time', numpy.float64), ('nodes', numpy.int32), ('ntasks', numpy.int32),
+                         ('req_time', numpy.float64), ('req_energy', numpy.float64), ('ops', numpy.float64),
+                         ('memory', numpy.float64), ('memory_vol', numpy.float64)])
+
+    def __init__(self, capacity: int = 1024):
+        self.rows = numpy.zeros(capacity, dtype=self.DTYPE)
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def add(self, job: Job):
+        if self.length == self.rows.size:
+            self.rows = numpy.concatenate((self.rows, numpy.zeros(self.rows.size, dtype=self.DTYPE)))
+        self.rows[self.length] = (job.id, job.submit_time, job.start_time, job.finish_time, job.nodes, job.ntasks,
+                                  job.req_time, job.req_energy, job.ops, job.memory, job.memory_vol)
+        self.length += 1
+
+    def array(self) -> numpy.ndarray:
+        return self.rows[:self.length].copy()
@@ -0,0 +1,51 @@
+from irmasim.Job import Job
+from irmasim.WorkloadReader import WorkloadReader
+
+
+class JobSource:
+    """ Iterator over the Jobs of a trajectory, built one at a time from the workload records. Its state is just the
+    position in the workload, so a copy reads the workload again from there. """
+
+    def __init__(self, workload: WorkloadReader, trajectory_origin: int, trajectory_length: int, simulation_time: float):
+        self.workload = workload
+        self.position = trajectory_origin
+        self.end = trajectory_origin + trajectory_length
+        self.simulation_time = simulation_time
+        self.first_job_subtime = None
+        self.records = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Job:
+        if self.position >= self.end:
+            raise StopIteration
+        if self.records is None:
+            self.records = self.workload.jobs(self.position)
+        job = next(self.records)
+        job_id = self.position
+        self.position += 1
+        if self.first_job_subtime is None:
+            self.first_job_subtime = job['subtime']
+        if 'profile' in job:
+            return Job.from_profile(job_id, job['id'], job['subtime']-self.first_job_subtime + self.simulation_time,
+                             job['nodes'], job['ntasks'], job['ntasks_per_node'],
+                             self.workload.profiles[job['profile']], job['profile'])
+        else:
+            if 'ipc' not in job:
+                job['ipc'] = 1.0
+            if 'mem' not in job:
+                job['mem'] = 0.0
+            if 'mem_vol' not in job:
+                job['mem_vol'] = 0.0
+            if 'req_energy' not in job:
+                job['req_energy'] = 0.0
+            return Job(job_id, job['id'], job['subtime']-self.first_job_subtime + self.simulation_time,
+                job['nodes'], job['ntasks'], job['ntasks_per_node'], job['req_ops'], job['ipc'],
+                job['req_time'], job['req_energy'], job['mem'], job['mem_vol'])
+
+    def __getstate__(self):
+        # The reader of the records is opened again by the copy
+        state = self.__dict__.copy()
+        state['records'] = None
+        return state
@@ -2,15 +2,19 @@ import os.path as path
 
 
 class Options:
+    """ Process wide options, the configuration of the Simulators that are not given one of their own. """
 
     _instance = None
 
     def __new__(class_, *args, **kwargs):
         if not isinstance(class_._instance, class_):
             class_._instance = object.__new__(class_, *args, **kwargs)
-            class_._instance.options = {'seed': 0, 'output_dir': '.',
-                            'platform_library_path': path.join(path.dirname(__file__), 'data')}
+            class_._instance.options = class_.defaults()
         return class_._instance
 
+    @staticmethod
+    def defaults() -> dict:
+        return {'seed': 0, 'output_dir': '.', 'platform_library_path': path.join(path.dirname(__file__), 'data')}
+
     def get(self):
         return self.options
@@ -0,0 +1,34 @@
+from irmasim.Simulator import Simulator
+import numpy
+
+
+class Result:
+    """ Outcome of a simulation run in memory. Like the statistics printed by irmasim, it covers the last trajectory
+    of the run.
+
+    statistics maps every statistic to its values, jobs is the record of the finished jobs and metrics holds the
+    per job values of the metrics of the simulator, both NumPy structured arrays in finishing order. output is
+    the text the simulation printed and logs the contents of the logs, if they were kept. """
+
+    def __init__(self, simulator: Simulator, output: str = "", logs: dict = None):
+        self.statistics = simulator.get_statistics()
+        self.jobs = simulator.job_queue.finished_record.array()
+        self.metrics = self.job_metrics(self.jobs)
+        self.output = output
+        self.logs = {} if logs is None else logs
+
+    @staticmethod
+    def job_metrics(jobs: numpy.ndarray) -> numpy.ndarray:
+        # The same expressions as Simulator.update_statistics
+        metrics = numpy.zeros(jobs.size, dtype=[('id', numpy.int64)] + [(metric, numpy.float64)
+                                                                        for metric in Simulator.METRICS])
+        metrics['id'] = jobs['id']
+        response_time = jobs['finish_time'] - jobs['submit_time']
+        execution_time = jobs['finish_time'] - jobs['start_time']
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            metrics['slowdown'] = response_time / execution_time
+            metrics['bounded_slowdown'] = numpy.maximum(response_time / numpy.maximum(execution_time, 10), 1)
+            metrics['user_slowdown'] = response_time / jobs['req_time']
+            metrics['waiting_time'] = jobs['start_time'] - jobs['submit_time']
+            metrics['relative_execution_time'] = execution_time / jobs['req_time']
+        return metrics
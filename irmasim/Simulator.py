@@ -1,12 +1,16 @@
 import math
 from irmasim.Job import Job
 from irmasim.JobQueue import JobQueue
+from irmasim.JobSource import JobSource
+from irmasim.WorkloadReader import WorkloadReader
+from irmasim.Accumulator import Accumulator
 from irmasim.workload_manager.WorkloadManager import WorkloadManager
 from irmasim.Options import Options
+import copy
 import importlib
+import itertools
 import os.path as path
 import json
-import csv
 import numpy
 import logging
 import random as rand
@@ -14,18 +18,40 @@ import random as rand
 
 class Simulator:
 
-    def __init__(self):
-        self.platform = self.build_platform()
+    METRICS = [ "slowdown", "bounded_slowdown", "user_slowdown", "waiting_time", "relative_execution_time" ]
+    # Keys of the independent random streams of a simulator
+    TRAJECTORY_STREAM = 0
+    AGENT_STREAM = 1
+
+    def __init__(self, options: dict = None, library: dict = None, workload: WorkloadReader = None, run: int = 0):
+        # Without options of its own the simulator is configured by the global Options
+        self.options = Options().get() if options is None else options
+        self.run = run
+        self.seed = int(self.options['seed'])
+        self.random = rand.Random()
+        self.seed_random(0)
+        self.platform = self.build_platform(library)
         #print(self.platform.pstr("  "))
-        self.workload = None
+        self.workload = workload
+        self.workload_file = self.options.get('workload_file')
+        self.workload_limits = None
         self.workload_manager = self.build_workload_manager()
+        # Events of the simulation when it is run step by step, a fork goes on from the same event
+        self.steps = None
+        self.steps_scope = None
+        self.decision = False
+        self.trajectory = 0
+        self.trajectory_started = False
         self.simulation_time = 0
         self.energy = 0
         self.energy_user_estimation = 0
+        self.core_count = self.platform.count_resources()[-1]
+        self.mops = self.platform.get_mops()
+        self.reset_statistics()
         self.logger = logging.getLogger("simulator")
 
         self.resource_logger = None
-        options = Options().get()
+        options = self.options
         if 'log_resource_type' in options:
             print(f"Logging resources of type {options['log_resource_type']}")
             mod = importlib.import_module('irmasim.platform.models.' + options['platform_model_name'] + \
@@ -36,84 +62,194 @@ class Simulator:
             self.resource_logger.info("time," + klass.header())
 
     def start_simulation(self) -> None:
-        options = Options().get()
+        for _ in self.simulation_steps():
+            pass
+
+    def simulation_steps(self, resume: bool = False):
+        options = self.options
         nbtrajectories = int(options['nbtrajectories'])
-        for i in range(nbtrajectories):
-            self.job_queue = self.generate_workload(self.simulation_time)
-            self.simulate_trajectory()
+        if resume and self.trajectory >= nbtrajectories:
+            return
+        for i in range(self.trajectory if resume else 0, nbtrajectories):
+            if not resume or i != self.trajectory:
+                self.start_trajectory(i)
+            yield from self.trajectory_steps()
+        self.trajectory = nbtrajectories
         self.workload_manager.on_end_simulation()
 
+    def next_event(self) -> bool:
+        """ Processes the next event of the simulation, which is started by the first call. Returns False once the
+        simulation has ended. """
+        if self.steps is None:
+            self.steps = self.simulation_steps()
+            self.steps_scope = 'simulation'
+        try:
+            self.decision = next(self.steps)
+            return True
+        except StopIteration:
+            return False
+
+    def run_until(self, time: float) -> bool:
+        """ Processes the events up to the given time. A trajectory that ends is followed by the next one. """
+        while self.steps is None or self.next_event_time() <= time or self.next_event_time() == math.inf:
+            if not self.next_event():
+                return False
+        return True
+
+    def run_until_decision(self) -> bool:
+        """ Processes the events up to the next one after which the workload manager ended a step. """
+        while self.next_event():
+            if self.decision:
+                return True
+        return False
+
+    def next_event_time(self) -> float:
+        return min([self.simulation_time + self.platform.get_next_step(), self.job_queue.get_next_step()])
+
+    def step_trajectory(self):
+        """ Makes next_event process the events of the current trajectory only. """
+        self.steps = self.trajectory_steps()
+        self.steps_scope = 'trajectory'
+
+    def fork(self) -> 'Simulator':
+        """ Copy of the simulator in its current state, which can be run on its own to evaluate alternatives.
+
+        The description of the platform and the workload are shared with the copy, everything that changes while
+        simulating is copied. A learning agent is only evaluated by the copy. A simulator being run step by step goes
+        on from the same event. """
+        memo = { id(shared): shared for shared in self.shared_objects() }
+        memo[id(self.steps)] = None
+        forked = copy.deepcopy(self, memo)
+        forked.workload_manager.on_fork()
+        forked.resume_steps()
+        return forked
+
+    def resume_steps(self):
+        """ Gives a copied simulator that was being run step by step a generator that goes on from the same event. """
+        if self.steps_scope == 'simulation':
+            self.steps = self.simulation_steps(resume=True)
+        elif self.steps_scope == 'trajectory':
+            self.steps = self.trajectory_steps()
+
+    def shared_objects(self) -> list:
+        return self.static_objects() + self.workload_manager.shared_objects()
+
+    def static_objects(self) -> list:
+        """ Objects that do not change while simulating, another simulator with the same options builds them equal
+        and in the same order. """
+        static = [ self.workload, self.platform.handles, self.logger, self.resource_logger ]
+        for resource in self.platform.resources:
+            static.append(resource.config)
+            if hasattr(resource, 'contention'):
+                static.append(resource.contention)
+        return [ obj for obj in static if obj is not None ]
+
+    def start_trajectory(self, trajectory: int):
+        self.trajectory = trajectory
+        self.trajectory_started = False
+        self.seed_random(trajectory)
+        self.job_queue = self.generate_workload(self.simulation_time)
+        self.reset_statistics()
+
+    def seed_random(self, trajectory: int):
+        """ Random stream of the trajectory for the simulator and the workload manager. Like every seed of the
+        simulator it is derived from the seed and the run, so it does not depend on what other simulators do. """
+        sequence = self.seed_sequence(self.TRAJECTORY_STREAM, trajectory)
+        self.random.seed(int(sequence.generate_state(1, numpy.uint64)[0]))
+
+    def set_seed(self, seed: int):
+        """ Changes the seed of this simulator from the next trajectory on, without changing its options. """
+        self.seed = int(seed)
+
+    def derive_seed(self, *keys: int) -> int:
+        return int(self.seed_sequence(*keys).generate_state(1, numpy.uint64)[0] >> 1)
+
+    def seed_sequence(self, *keys: int):
+        return numpy.random.SeedSequence([self.seed, self.run], spawn_key=keys)
+
     def simulate_trajectory(self) -> None:
-        logging.getLogger("irmasim").debug("Simulation start")
-        self.log_state()
-        first_jobs = self.job_queue.get_next_jobs(self.job_queue.get_next_step())
-        self.simulation_time += first_jobs[0].submit_time
-        self.platform.advance(self.simulation_time)
-        # TODO do something with joules
-        self.energy = self.platform.get_joules(self.simulation_time)
-        # self.statistics.calculate_energy_and_edp(self.resource_manager.core_pool, self.simulation_time)
-        logging.getLogger("irmasim").debug("{} Received job submission: {}".format( \
-                self.simulation_time, ",".join([str(job.id)+"("+job.name+")" for job in first_jobs])))
-        self.workload_manager.on_job_submission(first_jobs)
-        self.workload_manager.on_end_step()
-        
-        self.log_state()
-
-        delta_time_platform = self.platform.get_next_step()
-        # TODO unify get_next_step return value
-        delta_time_queue = self.job_queue.get_next_step() - self.simulation_time
-
-        delta_time = min([delta_time_platform, delta_time_queue])
-
-        while delta_time != math.inf:
+        for _ in self.trajectory_steps():
+            pass
+
+    def trajectory_steps(self):
+        """ The loop of a trajectory as a generator. It yields after every event, True if the workload manager
+        ended a step in it. A new generator goes on from the last event of a started trajectory. """
+        if not self.trajectory_started:
+            logging.getLogger("irmasim").debug("Simulation start")
+            self.log_state()
+            first_jobs = self.job_queue.get_next_jobs(self.job_queue.get_next_step())
+            self.simulation_time += first_jobs[0].submit_time
+            self.platform.advance(self.simulation_time)
+            # TODO do something with joules
+            self.energy = self.platform.get_joules(self.simulation_time)
+            # self.statistics.calculate_energy_and_edp(self.resource_manager.core_pool, self.simulation_time)
+            if logging.getLogger("irmasim").isEnabledFor(logging.DEBUG):
+                logging.getLogger("irmasim").debug("{} Received job submission: {}".format( \
+                        self.simulation_time, ",".join([str(job.id)+"("+job.name+")" for job in first_jobs])))
+            self.workload_manager.on_job_submission(first_jobs)
+            self.workload_manager.on_end_step()
+            self.trajectory_started = True
+            yield True
+
+        while True:
+            self.log_state()
+            delta_time_platform = self.platform.get_next_step()
+            # TODO unify get_next_step return value
+            delta_time_queue = self.job_queue.get_next_step() - self.simulation_time
+            delta_time = min([delta_time_platform, delta_time_queue])
+            if delta_time == math.inf:
+                break
+
             if delta_time != 0:
-                self.platform.advance(delta_time)
+                self.job_queue.complete_tasks(self.platform.advance(delta_time))
                 self.energy += self.platform.get_joules(delta_time)
                 self.simulation_time += delta_time
 
             if delta_time == delta_time_queue:
                 jobs = self.job_queue.get_next_jobs(self.simulation_time)
-                logging.getLogger("irmasim").debug("{} Received job submission: {}".format( \
-                        self.simulation_time, ",".join([str(job.id)+"("+job.name+")" for job in jobs])))
+                if logging.getLogger("irmasim").isEnabledFor(logging.DEBUG):
+                    logging.getLogger("irmasim").debug("{} Received job submission: {}".format( \
+                            self.simulation_time, ",".join([str(job.id)+"("+job.name+")" for job in jobs])))
                 self.workload_manager.on_job_submission(jobs)
 
+            # Jobs completed in a step of the queue wait for the next step of the platform, as they always have
             if delta_time == delta_time_platform:
                 jobs = self.job_queue.finish_jobs()
                 job_logger = logging.getLogger("jobs")
+                log_jobs = job_logger.isEnabledFor(logging.INFO)
                 for job in jobs:
                     job.finish_time = self.simulation_time
-                    [ job_logger.info(task_str) for task_str in job.task_strs() ]
+                    if log_jobs:
+                        [ job_logger.info(task_str) for task_str in job.task_strs() ]
                     self.energy_user_estimation += job.req_energy * job.ntasks
+                    self.update_statistics(job)
+                self.job_queue.record_jobs(jobs)
                 self.reap([task for job in jobs for task in job.tasks])
                 self.workload_manager.on_job_completion(jobs)
 
             if delta_time == delta_time_queue or delta_time == delta_time_platform:
                 self.workload_manager.on_end_step()
-
-            delta_time_platform = self.platform.get_next_step()
-            # TODO unify get_next_step return value
-            delta_time_queue = self.job_queue.get_next_step() - self.simulation_time
-            delta_time = min([delta_time_platform, delta_time_queue])
-            self.log_state()
+                yield True
+            else:
+                yield False
 
     def schedule(self, tasks: list):
         for task in tasks:
             task.job.set_start_time(self.simulation_time)
-            resource_id = task.resource[0]
-            if resource_id == self.platform.id:
+            self.job_queue.start_job(task.job)
+            if task.handle is None:
+                task.handle = self.platform.get_handle(task.resource)
+            if logging.getLogger("irmasim").isEnabledFor(logging.DEBUG):
                 logging.getLogger("irmasim").debug("{} {} launch task {} runs task {}".format( \
                         self.simulation_time, ".".join(task.resource), task.job.name, task.job.type))
-                self.platform.schedule(task, task.resource[1:])
-            else:
-                raise Exception(f"Resource {task.resource} does not belong to platform {self.platform.id}")
+            self.platform.schedule(task)
 
     def reap(self, tasks: list):
         for task in tasks:
-            resource_id = task.resource[0]
-            if resource_id == self.platform.id:
+            if logging.getLogger("irmasim").isEnabledFor(logging.DEBUG):
                 logging.getLogger("irmasim").debug("{} {} complete task {}".format( \
                         self.simulation_time, ".".join(task.resource), task.job.name))
-                self.platform.reap(task, task.resource[1:])
+            self.platform.reap(task)
 
     def get_next_step(self) -> float:
         return min([self.platform.get_next_step(), self.job_queue.get_next_step()])
@@ -125,23 +261,26 @@ class Simulator:
         return self.platform.enumerate_resources(resource_type)
     
     def get_resource(self, resource_id: list):
-        if resource_id.pop(0) == self.platform.id:
-            return self.platform.get_resource(resource_id)
-        else:
-            raise Exception(f"Resource {'.'.join(resource_id)} does not belong to platform {self.platform.id}")
+        return self.platform.get_resource_by_handle(self.platform.get_handle(resource_id))
 
-    def build_platform(self):
-        options = Options().get()
-        library = self._build_library(options.get('platform_file'), options['platform_library_path'])
+    def build_platform(self, library: dict = None):
+        options = self.options
+        if library is None:
+            library = self.build_library(options.get('platform_file'), options['platform_library_path'])
         platform_description = library['platform'][options['platform_name']]
         print(f'Using platform {options["platform_name"]}')
         options["platform_model_name"] = platform_description["model_name"]
+        if 'platform_engine' in options:
+            platform_description = dict(platform_description, engine=options['platform_engine'])
+        if 'speedup_error' in options:
+            platform_description = dict(platform_description, speedup_error=options['speedup_error'])
         mod = importlib.import_module("irmasim.platform.models."+platform_description["model_name"]+".ModelBuilder")
         klass = getattr(mod, 'ModelBuilder')
         model_builder = klass(platform_description=platform_description, library=library)
         return model_builder.build_platform()
 
-    def _build_library(self, platform_file_path: str, platform_library_path: str) -> dict:
+    @staticmethod
+    def build_library(platform_file_path: str, platform_library_path: str) -> dict:
         types = {}
         for pair in [('platform', 'platforms.json'), ('network', 'network_types.json'), ('node', 'node_types.json'),
                      ('processor', 'processor_types.json')]:
@@ -161,69 +300,53 @@ class Simulator:
         return types
 
     def get_workload_limits(self):
+        if self.workload_limits is None:
+            self.workload_limits = self.compute_workload_limits()
+        return self.workload_limits
+
+    def compute_workload_limits(self, jobs: list = None):
         def ntasks(job: dict):
             if 'res' in job:
                 return job['res']
             else:
                 return job['ntasks']
 
-        def from_profile(key: str, job: dict, workload: dict):
-            if 'profile' in job and key in workload['profiles'][job['profile']] and workload['profiles'][job['profile']][key] is not None:
-                return workload['profiles'][job['profile']][key]
+        def from_profile(key: str, job: dict, profiles: dict):
+            if 'profile' in job and key in profiles[job['profile']] and profiles[job['profile']][key] is not None:
+                return profiles[job['profile']][key]
             elif key in job and job[key] is not None:
                 return job[key]
             else:
                 return 1.0
 
         self.load_workload()
+        if jobs is None:
+            jobs = self.workload.jobs()
 
-        job_limits = {
-            'max_time': numpy.percentile(numpy.array(
-                [from_profile('req_time',job,self.workload) for job in self.workload['jobs']]), 99),
-            'max_core': numpy.percentile(numpy.array(
-                #TODO: Repensar en relacion a ntasks y ntasks-per-node. A lo mejor deberia llamarse max_tasks
-                [ntasks(job) for job in self.workload['jobs']]), 99),
-            'max_mem': numpy.percentile(numpy.array(
-                [from_profile('mem',job,self.workload) for job in self.workload['jobs']]), 99),
-            'max_mem_vol': numpy.percentile(numpy.array(
-                [from_profile('mem_vol',job,self.workload) for job in self.workload['jobs']]), 99)
-        }
+        values = { 'max_time': [], 'max_core': [], 'max_mem': [], 'max_mem_vol': [] }
+        for job in jobs:
+            values['max_time'].append(from_profile('req_time',job,self.workload.profiles))
+            #TODO: Repensar en relacion a ntasks y ntasks-per-node. A lo mejor deberia llamarse max_tasks
+            values['max_core'].append(ntasks(job))
+            values['max_mem'].append(from_profile('mem',job,self.workload.profiles))
+            values['max_mem_vol'].append(from_profile('mem_vol',job,self.workload.profiles))
+
+        job_limits = { limit: numpy.percentile(numpy.array(values[limit]), 99) for limit in values }
 
         return job_limits
 
     def load_workload(self):
-        options = Options().get()
+        options = self.options
         if self.workload == None:
-            if options['workload_file'].endswith('.json'):
-                with open(options['workload_file'], 'r') as in_f:
-                    self.workload = json.load(in_f)
-            elif options['workload_file'].endswith('.csv'):
-                self.workload = self.load_csv_workload(options['workload_file'])
-            else:
-                raise Exception(f"Unsupported workload file extension: {options['workload_file']}")
-            print(f'Loaded {len(self.workload["jobs"])} jobs from {options["workload_file"]}')
-
-    def load_csv_workload(self, filename:str):
-        workload = {'jobs': []}
-        with open(filename, 'r') as in_f:
-            reader = csv.DictReader(in_f)
-            for row in reader:
-                for key in row:
-                    try:
-                        row[key] = int(row[key])
-                    except:
-                        try:
-                            row[key] = float(row[key])
-                        except:
-                            pass
-                workload['jobs'].append(row)
-        return workload
+            self.workload = WorkloadReader(self.workload_file, options.get('workload_cache', False))
+            self.workload_limits = None
+            print(f'Loaded {len(self.workload)} jobs from {self.workload_file}')
 
     def generate_workload(self, simulation_time:float = 0.0):
         self.load_workload()
-        options = Options().get()
+        options = self.options
         if options['trajectory_length'] == 'random':
-            trajectory_length = rand.randint(1, len(self.workload['jobs']))
+            trajectory_length = self.random.randint(1, len(self.workload))
         else:
             trajectory_length = int(options['trajectory_length'])
 
@@ -231,67 +354,34 @@ class Simulator:
             l=trajectory_length
             if l == 0:
                 l = 1
-            trajectory_origin = rand.randint(0, len(self.workload['jobs'])-l)
+            trajectory_origin = self.random.randint(0, len(self.workload)-l)
         else:
             trajectory_origin = int(options['trajectory_origin'])
         if trajectory_length == 0:
-            trajectory_length = len(self.workload['jobs']) - trajectory_origin
+            trajectory_length = len(self.workload) - trajectory_origin
 
         print(f'Using {trajectory_length} jobs starting with #{trajectory_origin}')
-        
-        job_queue = JobQueue()
-        job_id = trajectory_origin
-        first_job_subtime = self.workload['jobs'][trajectory_origin]['subtime']
-        for i in range(trajectory_length):
-            job = self.workload['jobs'][trajectory_origin+i]
-            if 'id' not in job:
-                job['id'] = "job"+str(job_id)
-            if 'res' in job:
-                if 'nodes' in job or 'ntasks' in job or 'ntasks_per_node' in job:
-                    raise Exception(f"A job can specify a 'res' option or ('nodes','ntasks','ntasks_per_node'). But Job {job['id']} specify both")
-                job['nodes'] = 1
-                job['ntasks'] = job['res']
-                del job['res'] 
-            if 'ntasks' not in job and 'nodes' not in job:
-                raise Exception(f"Job {job['id']} requires specifying 'nodes' or 'ntasks' at least")
-            if 'ntasks' in job and 'nodes' in job and 'ntasks_per_node' in job:
-                if job['nodes'] != math.ceil(job['ntasks'] / job['ntasks_per_node']):
-                    raise Exception(f"Job {job['id']} specifies incompatible values of 'nodes' and 'ntasks' and 'ntasks_per_node'")
-            if 'nodes' not in job:
-                if 'ntasks_per_node' not in job:
-                   job['ntasks_per_node'] = 1
-                job['nodes'] = math.ceil(job['ntasks'] / job['ntasks_per_node'])
-            else:
-                if 'ntasks' not in job:
-                    if 'ntasks_per_node' not in job:
-                        job['ntasks_per_node'] = 1
-                    job['ntasks'] = job['nodes'] * job['ntasks_per_node']
-                else:
-                    job['ntasks_per_node'] = math.ceil(job['ntasks']/job['nodes'])
-            if 'profile' in job:
-                job_queue.add_job(
-                Job.from_profile(job_id, job['id'], job['subtime']-first_job_subtime + simulation_time,
-                                 job['nodes'], job['ntasks'], job['ntasks_per_node'],
-                                 self.workload['profiles'][job['profile']], job['profile']))
-            else:
-                if 'ipc' not in job:
-                    job['ipc'] = 1.0
-                if 'mem' not in job:
-                    job['mem'] = 0.0
-                if 'mem_vol' not in job:
-                    job['mem_vol'] = 0.0
-                if 'req_energy' not in job:
-                    job['req_energy'] = 0.0
-                job_queue.add_job(
-                Job(job_id, job['id'], job['subtime']-first_job_subtime + simulation_time,
-                    job['nodes'], job['ntasks'], job['ntasks_per_node'], job['req_ops'], job['ipc'],
-                    job['req_time'], job['req_energy'], job['mem'], job['mem_vol']))
-            job_id += 1
-
+        if options.get('workload_limits', 'workload') == 'trajectory':
+            self.workload_limits = self.compute_workload_limits(
+                    itertools.islice(self.workload.jobs(trajectory_origin), trajectory_length))
+
+        job_queue = JobQueue(options.get('finished_window'), bool(options.get('job_record', False)))
+        # Unsorted workloads need the whole trajectory queued, memory is only bounded when a window is set
+        job_queue.add_job_source(self.build_jobs(trajectory_origin, trajectory_length, simulation_time),
+                                 trajectory_length, float(options.get('workload_window', math.inf)))
         return job_queue
 
+    def set_workload(self, workload_file: str):
+        """ Reads the workload of the next trajectories from another file, without changing the options. """
+        self.workload_file = workload_file
+        self.workload = None
+        self.workload_limits = None
+
+    def build_jobs(self, trajectory_origin: int, trajectory_length: int, simulation_time: float):
+        return JobSource(self.workload, trajectory_origin, trajectory_length, simulation_time)
+
     def build_workload_manager(self):
-        options = Options().get()
+        options = self.options
         module_name = "irmasim.workload_manager." + options["workload_manager"]["type"]
         print(f'Using workload manager {module_name}')
         mod = importlib.import_module(module_name)
@@ -299,77 +389,80 @@ class Simulator:
         return klass(self)
 
     def log_state(self):
-        state = [ self.simulation_time, self.energy ]
-        state.extend(self.job_queue.get_job_counts())
+        if self.logger.isEnabledFor(logging.INFO):
+            state = [ self.simulation_time, self.energy ]
+            state.extend(self.job_queue.get_job_counts())
+            state.extend(self.utilisation_statistics().values())
+            state.extend(self.exploitation_statistics().values())
 
-        for stats in [ self.utilisation_statistics(),
-                       self.exploitation_statistics(),
-                       self.slowdown_statistics(),
-                       self.bounded_slowdown_statistics(),
-                       self.user_slowdown_statistics(),
-                       self.waiting_time_statistics(),
-                       self.relative_execution_time_statistics()]:
-           state.extend(stats.values())
+            for metric in self.METRICS:
+                statistic = self.statistics[metric]
+                state.extend([statistic.total, statistic.avg(), statistic.max, statistic.min])
 
-        self.logger.info(",".join(map(lambda x: str(x), state)))
+            self.logger.info(",".join(map(lambda x: str(x), state)))
 
-        if self.resource_logger != None:
+        if self.resource_logger != None and self.resource_logger.isEnabledFor(logging.INFO):
             for resource in self.log_resources:
                 self.resource_logger.info(str(self.simulation_time) + "," + resource.log_state())
 
-    def slowdown_statistics(self) -> dict:
-        sld_list = []
-        for job in self.job_queue.finished_jobs:
-            if job.finish_time - job.start_time == 0:
-                print(f"warning: {job.id} has 0 execution time")
-            sld_list.append(float(job.finish_time - job.submit_time) / (job.finish_time - job.start_time))
+    def reset_statistics(self):
+        quantiles = self.options.get('statistics_quantiles', [])
+        accuracy = float(self.options.get('statistics_quantile_accuracy', 0.01))
+        self.statistics = { metric: Accumulator(quantiles, accuracy) for metric in self.METRICS }
+        self.core_time = 0
+        self.executed_mop = 0
+
+    def update_statistics(self, job: Job):
+        if job.finish_time - job.start_time == 0:
+            print(f"warning: {job.id} has 0 execution time")
+        self.statistics["slowdown"].add(float(job.finish_time - job.submit_time) / (job.finish_time - job.start_time))
+        self.statistics["bounded_slowdown"].add(
+                max(float(job.finish_time - job.submit_time)/max(job.finish_time - job.start_time,10), 1))
+        self.statistics["user_slowdown"].add(float(job.finish_time - job.submit_time) / (job.req_time))
+        self.statistics["waiting_time"].add(float(job.start_time - job.submit_time))
+        self.statistics["relative_execution_time"].add(float(job.finish_time - job.start_time)/job.req_time)
+        self.core_time += (job.finish_time - job.start_time) * job.ntasks
+        self.executed_mop += job.ops * 1e-6 * job.ntasks
+
+    def get_statistics(self) -> dict:
+        statistics = { 'simulation_time': self.simulation_time_statistics(),
+                       'energy': self.energy_consumption_statistics(),
+                       'energy_user_estimation': self.energy_user_estimation_statistics(),
+                       'energy_efficiency': self.energy_efficiency_statistics(),
+                       'utilisation': self.utilisation_statistics(),
+                       'exploitation': self.exploitation_statistics(),
+                       'jobs': self.job_statistics() }
+        for metric in self.METRICS:
+            statistics[metric] = self.statistics[metric].statistics()
+        return statistics
 
-        return self.compute_statistics(sld_list)
+    def slowdown_statistics(self) -> dict:
+        return self.statistics["slowdown"].statistics()
 
     def user_slowdown_statistics(self) -> dict:
-        sld_list = []
-        for job in self.job_queue.finished_jobs:
-            if job.finish_time - job.start_time == 0:
-                print(f"warning: {job.id} has 0 execution time")
-            sld_list.append(float(job.finish_time - job.submit_time) / (job.req_time))
-
-        return self.compute_statistics(sld_list)
+        return self.statistics["user_slowdown"].statistics()
 
     def bounded_slowdown_statistics(self) -> dict:
-        bsld_list = []
-        for job in self.job_queue.finished_jobs:
-            bsld_list.append( max(float(job.finish_time - job.submit_time)/max(job.finish_time - job.start_time,10), 1) )
-
-        return self.compute_statistics(bsld_list)
+        return self.statistics["bounded_slowdown"].statistics()
 
     def relative_execution_time_statistics(self) -> dict:
-        ret_list = []
-        for job in self.job_queue.finished_jobs:
-            ret_list.append( float(job.finish_time - job.start_time)/job.req_time )
+        return self.statistics["relative_execution_time"].statistics()
 
-        return self.compute_statistics(ret_list)
-    
     def utilisation_statistics(self) -> dict:
         if(self.simulation_time == 0):
             return {"total": 0}
         else:
-            cpu_hours = sum([ (job.finish_time - job.start_time) * job.ntasks for job in self.job_queue.finished_jobs ])
-            cores = self.platform.count_resources()[-1]
-            return {"total": cpu_hours/self.simulation_time/cores}
+            return {"total": self.core_time/self.simulation_time/self.core_count}
 
     def exploitation_statistics(self) -> dict:
         if self.simulation_time == 0:
             return {"total": 0}
         else:
-            executed_mop = sum([ job.ops * 1e-6 * job.ntasks for job in self.job_queue.finished_jobs ])
-            total_mop = self.platform.get_mops() * self.simulation_time
-            return {"total": executed_mop/total_mop}
+            total_mop = self.mops * self.simulation_time
+            return {"total": self.executed_mop/total_mop}
 
     def waiting_time_statistics(self) -> dict:
-        waiting_time_list = []
-        for job in self.job_queue.finished_jobs:
-            waiting_time_list.append(float(job.start_time - job.submit_time))
-        return self.compute_statistics(waiting_time_list)
+        return self.statistics["waiting_time"].statistics()
 
     def energy_consumption_statistics(self) -> dict:
         return {"total": self.energy}
@@ -387,28 +480,9 @@ class Simulator:
         counts = self.job_queue.get_job_counts()
         return {"future": counts[0], "queue": counts[1], "running": counts[2], "finished": counts[3]}
 
-    def compute_statistics(self, statistic_list) -> dict:
-        total = 0.0
-        avg = 0.0
-        max = float(-math.inf)
-        min = float(math.inf)
-
-        for stat in statistic_list:
-            total += stat
-            if (stat > max):
-                max = stat
-            if (stat < min):
-                min = stat
-        try:
-            avg = total/len(statistic_list)
-        except:
-            avg = total/1
-
-        return {"total": total, "avg": avg, "max": max, "min": min}
-
     @classmethod
     def header(klass):
         header = "time,energy,future_jobs,pending_jobs,running_jobs,finished_jobs,utilisation,exploitation"
-        for metric in [ "slowdown", "bounded_slowdown", "user_slowdown", "waiting_time", "relative_execution_time" ]:
+        for metric in klass.METRICS:
            header += "," + ",".join([metric+"_"+stat for stat in ["total","avg","max","min"]])
         return header
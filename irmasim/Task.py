@@ -2,26 +2,61 @@ import math
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from irmasim.Job import Job
+    from irmasim.platform.EventCalendar import EventCalendar
 
 
 class Task:
 
+    __slots__ = ('job', 'resource', 'handle', 'slot', 'remaining_ops', 'event', 'last_update', 'opc', 'memory',
+                 'memory_volume', 'execution_time', 'finished')
+
     def __init__(self, job: 'Job', ops: float, opc: float, memory: float, memory_volume: float):
         self.job = job
         self.resource = None
-        self.ops = ops
+        self.handle = None
+        # Position of the task among those of the resource that runs it, for resources that keep them in slots
+        self.slot = None
+        # While the task runs its ops are kept by its event in the calendar
+        self.remaining_ops = ops
+        self.event = None
+        self.last_update = 0.0
         self.opc = opc
         self.memory = memory
         self.memory_volume = memory_volume
         self.execution_time = 0
+        self.finished = False
+
+    @property
+    def ops(self):
+        if self.event is None:
+            return self.remaining_ops
+        return self.event[0] - self.event[3].done
 
-    def allocate(self, resource: list):
+    def allocate(self, resource: list, handle: int = None):
         self.resource = resource
+        self.handle = handle
+
+    def run(self, owner, rate: float, calendar: 'EventCalendar', hidden: bool = False):
+        """ Runs the task at the given rate from now on. The owner is told when the task runs out of ops. """
+        self.stop(calendar)
+        self.event = calendar.start(None if self.finished else owner, self.remaining_ops, rate, hidden)
+
+    def stop(self, calendar: 'EventCalendar'):
+        if self.event is not None:
+            self.remaining_ops = calendar.stop(self.event)
+            self.event = None
+            if not self.finished:
+                self.execution_time += calendar.now - self.last_update
+        self.last_update = calendar.now
 
-    def advance(self, delta_time: float, delta_ops: float):
-        self.ops -= round(delta_ops)
+    def complete(self, calendar: 'EventCalendar'):
+        # Time only counts while the task has ops left at the end of a step
         if self.ops >= 0:
-            self.execution_time += delta_time
+            self.execution_time += calendar.now - self.last_update
+        else:
+            self.execution_time += calendar.previous - self.last_update
+        self.last_update = calendar.now
+        self.finished = True
 
     def __str__(self):
         return ",".join(map(lambda x: str(x), [self.job.id, self.resource, self.ops]))
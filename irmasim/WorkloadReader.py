@@ -0,0 +1,334 @@
+import csv
+import hashlib
+import io
+import itertools
+import json
+import math
+import numpy
+import os.path as path
+import re
+
+
+def number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+class JsonScanner:
+    """ Decodes the values of a JSON document one at a time from a file, reading it in chunks. With a list of marks,
+    the byte offset of every step-th job is appended to it. """
+
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, in_f, marks: list = None, step: int = 1):
+        self.in_f = in_f
+        self.buffer = ""
+        self.position = 0
+        # Byte offset in the file of the start of the buffer, only kept when marks are taken
+        self.offset = 0
+        self.marks = marks
+        self.step = step
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.whitespace = re.compile(r'\s*')
+
+    def fill(self):
+        chunk = self.in_f.read(max(self.CHUNK_SIZE, len(self.buffer) - self.position))
+        if self.marks is not None:
+            self.offset += len(self.buffer[:self.position].encode(self.in_f.encoding))
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        self.eof = chunk == ""
+
+    def peek(self):
+        while True:
+            self.position = self.whitespace.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self.fill()
+
+    def tell(self):
+        return self.offset + len(self.buffer[:self.position].encode(self.in_f.encoding))
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise Exception(f"Malformed workload file: expected '{char}' in {self.in_f.name}")
+        self.position += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def members(self):
+        """ Yields the members of the top level object, the elements of the 'jobs' array one by one. """
+        self.expect('{')
+        while self.peek() != '}':
+            key = self.value()
+            self.expect(':')
+            if key == 'jobs':
+                self.expect('[')
+                count = 0
+                while self.peek() != ']':
+                    if self.marks is not None and count % self.step == 0:
+                        self.marks.append(self.tell())
+                    yield key, self.value()
+                    count += 1
+                    if self.peek() == ',':
+                        self.expect(',')
+                self.expect(']')
+            else:
+                yield key, self.value()
+            if self.peek() == ',':
+                self.expect(',')
+        self.expect('}')
+
+    def elements(self):
+        """ Yields the rest of an array, from the start of one of its elements. """
+        while self.peek() != ']':
+            yield self.value()
+            if self.peek() == ',':
+                self.expect(',')
+
+
+class WorkloadReader:
+    """ Reads job records on demand from JSON, CSV or SWF workload files. """
+
+    CACHE_VERSION = 1
+    COLUMNS = ['subtime', 'nodes', 'ntasks', 'ntasks_per_node', 'req_ops', 'ipc', 'req_time', 'req_energy', 'mem',
+               'mem_vol']
+    BLOCK_SIZE = 4096
+    # Records between two saved offsets, a trajectory is read from the offset before its origin
+    OFFSET_STEP = 4096
+
+    def __init__(self, filename: str, cache: bool = False):
+        self.filename = filename
+        if filename.endswith('.json'):
+            self.read_records = self.read_json
+        elif filename.endswith('.csv'):
+            self.read_records = self.read_csv
+        elif filename.endswith('.swf'):
+            self.read_records = self.read_swf
+        else:
+            raise Exception(f"Unsupported workload file extension: {filename}")
+        self.profiles = {}
+        self.length = 0
+        self.columns = None
+        self.offsets = []
+        if cache:
+            self.cache_file = filename + '.npz'
+            self.digest = self.hash()
+            if self.load_cache():
+                return
+        # The jobs are counted in a first pass, which also collects the profiles wherever they are in the file
+        # and saves the offset of every OFFSET_STEP-th job
+        if self.read_records == self.read_json:
+            with self.open_json() as in_f:
+                for key, value in JsonScanner(in_f, self.offsets, self.OFFSET_STEP).members():
+                    if key == 'jobs':
+                        self.length += 1
+                    elif key == 'profiles':
+                        self.profiles = value
+        else:
+            for _ in self.read_records(offsets=self.offsets):
+                self.length += 1
+        if cache:
+            self.compile()
+
+    def __len__(self):
+        return self.length
+
+    def jobs(self, origin: int = 0):
+        if self.columns is not None:
+            return self.read_columns(origin)
+        if self.offsets:
+            block = min(origin // self.OFFSET_STEP, len(self.offsets) - 1)
+            records = itertools.islice(self.read_records(self.offsets[block]), origin - block * self.OFFSET_STEP, None)
+        else:
+            records = itertools.islice(self.read_records(), origin, None)
+        return (self.normalise(job, index) for index, job in enumerate(records, origin))
+
+    def normalise(self, job: dict, index: int):
+        if 'id' not in job:
+            job['id'] = "job"+str(index)
+        if 'res' in job:
+            if 'nodes' in job or 'ntasks' in job or 'ntasks_per_node' in job:
+                raise Exception(f"A job can specify a 'res' option or ('nodes','ntasks','ntasks_per_node'). But Job {job['id']} specify both")
+            job['nodes'] = 1
+            job['ntasks'] = job['res']
+            del job['res']
+        if 'ntasks' not in job and 'nodes' not in job:
+            raise Exception(f"Job {job['id']} requires specifying 'nodes' or 'ntasks' at least")
+        if 'ntasks' in job and 'nodes' in job and 'ntasks_per_node' in job:
+            if job['nodes'] != math.ceil(job['ntasks'] / job['ntasks_per_node']):
+                raise Exception(f"Job {job['id']} specifies incompatible values of 'nodes' and 'ntasks' and 'ntasks_per_node'")
+        if 'nodes' not in job:
+            if 'ntasks_per_node' not in job:
+               job['ntasks_per_node'] = 1
+            job['nodes'] = math.ceil(job['ntasks'] / job['ntasks_per_node'])
+        else:
+            if 'ntasks' not in job:
+                if 'ntasks_per_node' not in job:
+                    job['ntasks_per_node'] = 1
+                job['ntasks'] = job['nodes'] * job['ntasks_per_node']
+            else:
+                job['ntasks_per_node'] = math.ceil(job['ntasks']/job['nodes'])
+        return job
+
+    def hash(self):
+        digest = hashlib.sha256()
+        with open(self.filename, 'rb') as in_f:
+            for chunk in iter(lambda: in_f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load_cache(self):
+        if not path.isfile(self.cache_file):
+            return False
+        data = numpy.load(self.cache_file)
+        if int(data['version']) != self.CACHE_VERSION or str(data['hash']) != self.digest:
+            return False
+        self.set_columns(data)
+        print(f'Using compiled workload {self.cache_file}')
+        return True
+
+    def load(self):
+        """ Keeps the normalised jobs in memory, later trajectories are read from it instead of the file. """
+        if self.columns is None:
+            try:
+                self.set_columns(self.build_columns())
+            except (TypeError, ValueError) as error:
+                print(f'warning: could not keep workload {self.filename} in memory: {error}')
+
+    def compile(self):
+        try:
+            numpy.savez(self.cache_file, version=self.CACHE_VERSION, hash=self.digest, **self.build_columns())
+            print(f'Compiled workload into {self.cache_file}')
+        except (OSError, TypeError, ValueError) as error:
+            print(f'warning: could not write compiled workload {self.cache_file}: {error}')
+
+    def build_columns(self):
+        # Normalised jobs as one array per field. Missing values are stored as NaN so that defaults are still
+        # applied when the Jobs are built, and a mask per field tells which values are given back as ints
+        names, profile_ids, profile_names = [], [], {}
+        values = { column: [] for column in self.COLUMNS }
+        for job in self.jobs():
+            names.append(str(job['id']))
+            if 'profile' in job:
+                profile_ids.append(profile_names.setdefault(job['profile'], len(profile_names)))
+            else:
+                profile_ids.append(-1)
+            for column in self.COLUMNS:
+                values[column].append(job.get(column))
+        columns = { 'names': numpy.array(names), 'profile_ids': numpy.array(profile_ids, dtype=numpy.int32),
+                    'profile_names': numpy.array(list(profile_names), dtype=str),
+                    'profiles': json.dumps(self.profiles) }
+        for column in self.COLUMNS:
+            columns['column_' + column] = numpy.array(
+                    [math.nan if value is None else value for value in values[column]], dtype=numpy.float64)
+            columns['integer_' + column] = numpy.array(
+                    [type(value) is int for value in values[column]], dtype=bool)
+        return columns
+
+    def set_columns(self, data):
+        self.names = data['names']
+        self.profile_ids = data['profile_ids']
+        self.profile_names = data['profile_names'].tolist()
+        self.profiles = json.loads(str(data['profiles']))
+        self.columns = { column: (data['column_' + column], data['integer_' + column]) for column in self.COLUMNS }
+        self.length = len(self.names)
+
+    def read_columns(self, origin: int):
+        for block in range(origin, self.length, self.BLOCK_SIZE):
+            end = min(block + self.BLOCK_SIZE, self.length)
+            names = self.names[block:end].tolist()
+            profile_ids = self.profile_ids[block:end].tolist()
+            columns = [(column, values[block:end].tolist(), integers[block:end].tolist())
+                       for column, (values, integers) in self.columns.items()]
+            for i in range(end - block):
+                job = { 'id': names[i] }
+                if profile_ids[i] >= 0:
+                    job['profile'] = self.profile_names[profile_ids[i]]
+                for column, values, integers in columns:
+                    if not math.isnan(values[i]):
+                        job[column] = int(values[i]) if integers[i] else values[i]
+                yield job
+
+    def open_json(self, offset: int = None):
+        # Offsets are in bytes, newlines are not translated so that decoded text has the same length in the file
+        raw = open(self.filename, 'rb')
+        if offset is not None:
+            raw.seek(offset)
+        return io.TextIOWrapper(raw, newline='')
+
+    def read_json(self, offset: int = None, offsets: list = None):
+        with self.open_json(offset) as in_f:
+            if offset is not None:
+                yield from JsonScanner(in_f).elements()
+            else:
+                for key, value in JsonScanner(in_f, offsets, self.OFFSET_STEP).members():
+                    if key == 'jobs':
+                        yield value
+
+    def read_csv(self, offset: int = None, offsets: list = None):
+        with open(self.filename, 'r') as in_f:
+            # Lines are read with readline, so that the position of the file can be told and restored
+            reader = csv.DictReader(iter(in_f.readline, ''))
+            # The header is read before moving to the offset
+            reader.fieldnames
+            if offset is not None:
+                in_f.seek(offset)
+            count = 0
+            while True:
+                if offsets is not None and count % self.OFFSET_STEP == 0:
+                    offsets.append(in_f.tell())
+                row = next(reader, None)
+                if row is None:
+                    break
+                count += 1
+                for key in row:
+                    try:
+                        row[key] = int(row[key])
+                    except:
+                        try:
+                            row[key] = float(row[key])
+                        except:
+                            pass
+                yield row
+
+    def read_swf(self, offset: int = None, offsets: list = None):
+        # Same conversion as utils/swf2irmasim_workload.py with a 1 GHz reference processor. The requested time
+        # falls back to the run time when the trace does not record it
+        with open(self.filename, 'r') as in_f:
+            if offset is not None:
+                in_f.seek(offset)
+            count = 0
+            if offsets is not None:
+                offsets.append(in_f.tell())
+            for line in iter(in_f.readline, ''):
+                row = line.split()
+                if len(row) < 9 or row[0].startswith(';'):
+                    continue
+                run_time = number(row[3])
+                ntasks = int(row[4])
+                if run_time <= 0 or ntasks <= 0:
+                    continue
+                req_time = number(row[8])
+                if req_time <= 0:
+                    req_time = run_time
+                yield {'id': f'job{row[0]}', 'subtime': number(row[1]), 'ntasks': ntasks, 'nodes': 1,
+                       'req_ops': int(run_time * 1e9), 'ipc': 1, 'req_time': req_time, 'mem': 0, 'mem_vol': 0}
+                count += 1
+                if offsets is not None and count % self.OFFSET_STEP == 0:
+                    offsets.append(in_f.tell())
@@ -3,3 +3,10 @@ Load metainformation about the package.
 """
 
 from .__meta__ import *
+
+
+def run(*args, **kwargs):
+    """ Simulates a run of an experiment in memory and returns its :class:`~irmasim.Result.Result`, see
+    :func:`irmasim.cmd.run`. The simulator is imported on use, so that the metainformation can be read without it. """
+    from irmasim.cmd import run
+    return run(*args, **kwargs)
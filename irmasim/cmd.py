@@ -1,5 +1,13 @@
 import argparse as ap
+import contextlib
+import copy
+import csv
+import importlib
+import io
+import itertools
 import json
+import multiprocessing
+import shutil
 import sys
 import os
 import pickle
@@ -9,9 +17,20 @@ import random as rnd
 import time
 import logging
 from irmasim.Simulator import Simulator
+from irmasim.Checkpoint import Checkpoint
+from irmasim.Result import Result
+from irmasim.WorkloadReader import WorkloadReader
 from irmasim.Options import Options
 from irmasim.Job import Job
 
+LOG_FILES = ["irmasim.log", "simulation.log", "jobs.log", "resources.log"]
+# Logs that every run starts with a header
+HEADER_FILES = ["simulation.log", "jobs.log", "resources.log", "probs.log"]
+# Log written by each logger
+LOGGERS = { "irmasim": "irmasim.log", "simulator": "simulation.log", "jobs": "jobs.log", "resources": "resources.log" }
+# Logs that grow during the simulations, a resumed simulation cuts them back to their size in the checkpoint
+APPENDED_FILES = LOG_FILES + ["probs.log", "rewards.log", "losses.log"]
+
 def launch() -> None:
     start_time = time.time()
     parser = ap.ArgumentParser(description='Launches IRMaSim experiments')
@@ -22,6 +41,7 @@ def launch() -> None:
     parser.add_argument('-nt', '--nbtrajectories', type=str, help='Number of trajectories per run')
     parser.add_argument('-to', '--trajectory_origin', type=str, help='First job to submit')
     parser.add_argument('-tl', '--trajectory_length', type=str, help='Number of jobs to submit')
+    parser.add_argument('-c', '--workload_cache', action="store_true", help='Compile the workload into a cache file next to it, reused while the workload does not change')
     parser.add_argument('-o', '--output_dir', type=str, help='Directory for output files')
 
     parser.add_argument('-wm', '--workload_manager', type=str, help='The type of workload manager to use')
@@ -29,6 +49,10 @@ def launch() -> None:
     parser.add_argument('-im', '--inmodel', type=str, help='Path for previous model loading')
     parser.add_argument('-om', '--outmodel', type=str, help='Path for saving new model, can be the same as the inmodel')
     parser.add_argument('-nr', '--nbruns', type=int, default=1, help='Number of simulations to run')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of runs to simulate in parallel')
+    parser.add_argument('-ci', '--checkpoint_interval', type=float, help='Simulated seconds between checkpoints')
+    parser.add_argument('-ce', '--checkpoint_events', type=int, help='Events between checkpoints')
+    parser.add_argument('-r', '--resume', action="store_true", help='Resume the simulation from the checkpoint in the output directory')
     parser.add_argument('-ph', '--phase', type=str, default="train", help='Agent operation phase: train, eval')
     parser.add_argument('-v', '--verbose', action="store_true", help='Remove prints in stdout')
     parser.add_argument('-x', '--extra', type=str, action="append", help='Add arbitrary entries to configuration')
@@ -64,6 +88,12 @@ def launch() -> None:
         options['trajectory_length'] = '0'
     if args.trajectory_length:
         options['trajectory_length'] = args.trajectory_length
+    if args.workload_cache:
+        options['workload_cache'] = True
+    if args.checkpoint_interval:
+        options['checkpoint_interval'] = args.checkpoint_interval
+    if args.checkpoint_events:
+        options['checkpoint_events'] = args.checkpoint_events
     if args.output_dir:
         options['output_dir'] = args.output_dir
     else:
@@ -121,39 +151,339 @@ def launch() -> None:
         print('Need to specify a workload manager to simulate. Either with -w or in an options_file.')
         sys.exit(1)
 
-    # Set the seed for pseudo-random number generators
-    print(f"Setting the random seed to {options['seed']}")
-    rnd.seed(options['seed'])
-    np.random.seed(options['seed'])
+    checkpoint = None
+    if args.resume or 'checkpoint_interval' in options or 'checkpoint_events' in options:
+        if args.jobs > 1 and args.nbruns > 1:
+            print('Checkpoints are only written when the runs are simulated one after the other.')
+            sys.exit(1)
+        checkpoint = Checkpoint(options, APPENDED_FILES)
+        if args.resume and not checkpoint.exists():
+            print(f'There is no checkpoint to resume in {checkpoint.file}.')
+            sys.exit(1)
+
+    if args.jobs > 1 and args.nbruns > 1:
+        if options['workload_manager']['type'] == 'Policy' and options['workload_manager']['agent']['phase'] == 'train':
+            launch_training(args.nbruns, args.jobs)
+        else:
+            launch_pool(args.nbruns, args.jobs)
+    else:
+        # Set the seed for pseudo-random number generators
+        print(f"Setting the random seed to {options['seed']}")
+        rnd.seed(options['seed'])
+        np.random.seed(options['seed'])
+
+        first_run, simulator = 0, None
+        if args.resume:
+            first_run, simulator = checkpoint.restore(options)
+        start_logging(options, append=args.resume)
+        for run in range(first_run, args.nbruns):
+            simulate(run, options, checkpoint=checkpoint, simulator=simulator)
+            simulator = None
+
+    #os.remove(options['output_dir'] + "/simulator.pickle")
+    print("Execution time " + str(time.time() - start_time) + " seconds")
+
+    sys.exit(0)
 
-    start_logging()
-    simulator_handler = logging.getLogger("simulator").handlers[0]
-    job_handler = logging.getLogger("jobs").handlers[0]
-    resource_handler = logging.getLogger("resources").handlers[0]
-    for run in range(args.nbruns):
-        simulator = Simulator()
+def simulate(run: int, options: dict, library: dict = None, workload: WorkloadReader = None,
+             agent_state: dict = None, checkpoint: Checkpoint = None, simulator: Simulator = None) -> Simulator:
+    if simulator is None:
+        simulator = Simulator(options=options, library=library, workload=workload, run=run)
+        if agent_state is not None:
+            simulator.workload_manager.agent.load_state_dict(agent_state)
         print(f'Starting simulation run: {run}')
-        simulator_handler.setFormatter(logging.Formatter(f'{run},%(message)s'))
-        job_handler.setFormatter(logging.Formatter(f'{run},%(message)s'))
-        resource_handler.setFormatter(logging.Formatter(f'{run},%(message)s'))
+    else:
+        print(f'Resuming simulation run: {run}')
+    for logger in ["simulator", "jobs", "resources"]:
+        logging.getLogger(logger).handlers[0].setFormatter(logging.Formatter(f'{run},%(message)s'))
+    if checkpoint is None:
         simulator.start_simulation()
-        print_statistics("Simulation time:", simulator.simulation_time_statistics())
-        print_statistics("Energy consumption:", simulator.energy_consumption_statistics())
-        print_statistics("User energy estimation:", simulator.energy_user_estimation_statistics())
-        print_statistics("Energy efficiency:", simulator.energy_efficiency_statistics())
-        print_statistics("Utilisation:", simulator.utilisation_statistics())
-        print_statistics("Exploitation:", simulator.exploitation_statistics())
-        print_statistics("Jobs:", simulator.job_statistics())
-        print_statistics("Slowdown: ",simulator.slowdown_statistics())
-        print_statistics("Bounded Slowdown: ",simulator.bounded_slowdown_statistics())
-        print_statistics("Waiting Time: ",simulator.waiting_time_statistics())
-        print_statistics("Relative Execution Time: ",simulator.relative_execution_time_statistics())
+    else:
+        checkpoint.simulate(run, simulator)
+    print_statistics("Simulation time:", simulator.simulation_time_statistics())
+    print_statistics("Energy consumption:", simulator.energy_consumption_statistics())
+    print_statistics("User energy estimation:", simulator.energy_user_estimation_statistics())
+    print_statistics("Energy efficiency:", simulator.energy_efficiency_statistics())
+    print_statistics("Utilisation:", simulator.utilisation_statistics())
+    print_statistics("Exploitation:", simulator.exploitation_statistics())
+    print_statistics("Jobs:", simulator.job_statistics())
+    print_statistics("Slowdown: ",simulator.slowdown_statistics())
+    print_statistics("Bounded Slowdown: ",simulator.bounded_slowdown_statistics())
+    print_statistics("Waiting Time: ",simulator.waiting_time_statistics())
+    print_statistics("Relative Execution Time: ",simulator.relative_execution_time_statistics())
+    if checkpoint is not None:
+        checkpoint.save(run + 1)
+    return simulator
 
-    #os.remove(options['output_dir'] + "/simulator.pickle")
+def run(config, run: int = 0, logs: bool = False, library: dict = None, workload: WorkloadReader = None) -> Result:
+    """ Simulates a run of an experiment in memory. The configuration is a dictionary of options like those of an
+    options file, or the name of one. Nothing is printed and, unless they are kept in memory, nothing is logged.
+    Workload managers that learn still write their own logs into the output directory.
+
+    A library and a workload built beforehand are shared, so that many configurations can be simulated without
+    reading them again. """
+    options = Options.defaults()
+    if isinstance(config, str):
+        with open(config, 'r') as in_f:
+            config = json.load(in_f)
+    options.update(copy.deepcopy(config))
+    complete_options(options)
+    options['job_record'] = True
+    options.setdefault('finished_window', 0)
+    output = io.StringIO()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(contextlib.redirect_stdout(output))
+        buffers = stack.enter_context(memory_logging(options, run, logs))
+        # The weights of a new agent come from the generator of torch, which is left as it was
+        if options['workload_manager']['type'] == 'Policy':
+            if not path.exists(options['output_dir']):
+                os.makedirs(options['output_dir'])
+            torch = importlib.import_module('torch')
+            stack.enter_context(torch.random.fork_rng(devices=[]))
+            torch.manual_seed(int(options['seed']))
+        simulator = Simulator(options=options, library=library, workload=workload, run=run)
+        simulator.start_simulation()
+    return Result(simulator, output.getvalue(), { log: buffer.getvalue() for log, buffer in buffers.items() })
+
+@contextlib.contextmanager
+def memory_logging(options: dict, run: int, keep: bool):
+    """ Sends the logs into buffers while simulating or, if they are not kept, turns them off. The loggers are left
+    as they were afterwards. """
+    levels = { 'DEBUG': logging.DEBUG, 'INFO': logging.INFO }
+    buffers = {}
+    saved = []
+    for name, log in LOGGERS.items():
+        logger = logging.getLogger(name)
+        saved.append((logger, logger.handlers, logger.level, logger.propagate, logger.disabled))
+        logger.handlers = []
+        logger.propagate = False
+        if keep:
+            buffers[log] = io.StringIO()
+            handler = logging.StreamHandler(buffers[log])
+            if name != "irmasim":
+                handler.setFormatter(logging.Formatter(f'{run},%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(levels[options.get('log_level', 'INFO')] if name == "irmasim" else logging.INFO)
+        else:
+            logger.disabled = True
+    if keep:
+        buffers["simulation.log"].write("run," + Simulator.header() + "\n")
+        buffers["jobs.log"].write("run," + Job.header() + "\n")
+    try:
+        yield buffers
+    finally:
+        for logger, handlers, level, propagate, disabled in saved:
+            logger.handlers = handlers
+            logger.setLevel(level)
+            logger.propagate = propagate
+            logger.disabled = disabled
+
+def launch_pool(nbruns: int, processes: int):
+    """ Simulates the runs in a pool of processes. Every run logs into a directory of its own, which are merged
+    into the output directory in run order once all have finished. """
+    options = Options().get()
+    print(f"Simulating {nbruns} runs in {processes} processes")
+    if not path.exists(options['output_dir']):
+        os.makedirs(options['output_dir'])
+    # A fresh process for each run, the loggers are configured once per process
+    with multiprocessing.Pool(processes, maxtasksperchild=1) as pool:
+        outputs = pool.starmap(simulate_shard, [ (run, options) for run in range(nbruns) ], chunksize=1)
+    for run, output in enumerate(outputs):
+        print(output, end='')
+        merge_shard(shard_dir(options['output_dir'], run), options['output_dir'], run == 0)
+
+def launch_training(nbruns: int, processes: int):
+    """ Trains the agent of a Policy workload manager with synchronous rollouts. Every iteration the pool simulates
+    up to one run per process with the current weights of the agent, and the learner updates it once with all of
+    them. """
+    options = Options().get()
+    print(f"Training with {processes} rollouts per update")
+    rnd.seed(options['seed'])
+    np.random.seed(options['seed'])
+    torch = importlib.import_module('torch')
+    torch.manual_seed(options['seed'])
+    if not path.exists(options['output_dir']):
+        os.makedirs(options['output_dir'])
+    # The learner only needs the agent and the optimizer of a Policy workload manager
+    with contextlib.redirect_stdout(io.StringIO()):
+        learner = Simulator(options=options).workload_manager
+    rollout_options = copy.deepcopy(options)
+    rollout_options['workload_manager']['agent']['phase'] = 'rollout'
+    rollout_options['workload_manager']['agent'].pop('output_model', None)
+    with multiprocessing.Pool(processes, maxtasksperchild=1) as pool:
+        for first in range(0, nbruns, processes):
+            runs = range(first, min(first + processes, nbruns))
+            agent_state = learner.agent.state_dict()
+            results = pool.starmap(simulate_shard, [ (run, rollout_options, agent_state) for run in runs ],
+                                   chunksize=1)
+            for run, (output, rollout) in zip(runs, results):
+                print(output, end='')
+                merge_shard(shard_dir(options['output_dir'], run), options['output_dir'], run == 0)
+            learner.learn([ rollout for output, rollout in results ])
+
+def simulate_shard(run: int, options: dict, agent_state: dict = None):
+    options = dict(options)
+    options['output_dir'] = shard_dir(options['output_dir'], run)
+    rnd.seed(options['seed'] + run)
+    np.random.seed(options['seed'] + run)
+    # Forked workers would otherwise share the state of torch's generator
+    if 'torch' in sys.modules:
+        sys.modules['torch'].manual_seed(options['seed'] + run)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start_logging(options)
+        simulator = simulate(run, options, agent_state=agent_state)
+    logging.shutdown()
+    if agent_state is None:
+        return output.getvalue()
+    else:
+        return output.getvalue(), simulator.workload_manager.rollout()
+
+def shard_dir(output_dir: str, run: int) -> str:
+    return path.join(output_dir, f'run{run}')
+
+def merge_shard(shard: str, output_dir: str, first: bool):
+    # Logs are appended to the merged ones without repeating their header. The simulation logs are started again
+    # by the first run, like start_logging does
+    for name in sorted(os.listdir(shard)):
+        merged = path.join(output_dir, name)
+        with open(path.join(shard, name), 'r') as in_f:
+            lines = in_f.readlines()
+        if first and name in LOG_FILES:
+            mode = 'w'
+        else:
+            mode = 'a'
+            if name in HEADER_FILES and lines and path.isfile(merged) and path.getsize(merged) > 0:
+                with open(merged, 'r') as merged_f:
+                    if merged_f.readline() == lines[0]:
+                        lines = lines[1:]
+        with open(merged, mode) as out_f:
+            out_f.writelines(lines)
+    shutil.rmtree(shard)
+
+# Platform libraries and workloads parsed before the sweep starts, the workers inherit them when forked
+shared_libraries = {}
+shared_workloads = {}
+
+def sweep() -> None:
+    parser = ap.ArgumentParser(description='Launches one IRMaSim simulation per configuration of a parameter sweep')
+    parser.add_argument('options_file', type=str, help='File with the base options of the experiment in json format')
+    parser.add_argument('sweep_file', type=str, help='File with the options to sweep in json format: a "grid" of values per option and/or a "list" of option sets')
+    parser.add_argument('-o', '--output_dir', type=str, default='sweep', help='Directory for output files, one subdirectory per configuration')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Number of configurations to simulate in parallel')
+    parser.add_argument('-v', '--verbose', action="store_true", help='Remove prints in stdout')
+    args = parser.parse_args()
+
+    if args.verbose:
+        sys.stdout = open("/dev/null", "w")
+    start_time = time.time()
+
+    options = Options().get()
+    print(f'Loading options from {args.options_file}')
+    with open(args.options_file, 'r') as in_f:
+        options.update(json.load(in_f))
+    with open(args.sweep_file, 'r') as in_f:
+        configurations = sweep_configurations(json.load(in_f))
+    keys = list(dict.fromkeys([ key for name, overrides in configurations for key in overrides ]))
+
+    jobs = sweep_jobs(options, configurations, args.output_dir)
+
+    for name, job_options in jobs:
+        platform_file = job_options.get('platform_file')
+        if platform_file not in shared_libraries:
+            shared_libraries[platform_file] = Simulator.build_library(platform_file,
+                                                                      job_options['platform_library_path'])
+        workload_file = job_options['workload_file']
+        if workload_file not in shared_workloads:
+            shared_workloads[workload_file] = WorkloadReader(workload_file, job_options.get('workload_cache', False))
+            shared_workloads[workload_file].load()
+            print(f'Loaded {len(shared_workloads[workload_file])} jobs from {workload_file}')
+
+    print(f'Simulating {len(jobs)} configurations in {args.jobs} processes')
+    if not path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+    with multiprocessing.Pool(args.jobs, maxtasksperchild=1) as pool:
+        results = pool.starmap(simulate_configuration, jobs, chunksize=1)
+
+    with open(path.join(args.output_dir, 'sweep.csv'), 'w', newline='') as out_f:
+        writer = None
+        for (name, overrides), (output, statistics) in zip(configurations, results):
+            print(f'Configuration {name}: ' + ", ".join([ f'{key}={overrides.get(key)}' for key in keys ]))
+            print(output, end='')
+            if writer is None:
+                writer = csv.writer(out_f)
+                writer.writerow(['configuration'] + keys + list(statistics))
+            writer.writerow([name] + [ option_str(overrides.get(key)) for key in keys ] + list(statistics.values()))
+    print(f'Results written to {path.join(args.output_dir, "sweep.csv")}')
     print("Execution time " + str(time.time() - start_time) + " seconds")
 
     sys.exit(0)
 
+def sweep_configurations(spec: dict) -> list:
+    """ Every set of options in the list combined with every point of the grid. A set may give its configuration
+    a name, which is also the name of its output directory. """
+    grid = spec.get('grid', {})
+    configurations = []
+    for option_set in spec.get('list', [{}]):
+        for values in itertools.product(*grid.values()):
+            # Copies, so that nested options set by one configuration do not reach the others
+            overrides = copy.deepcopy(option_set)
+            overrides.update(copy.deepcopy(dict(zip(grid.keys(), values))))
+            name = overrides.pop('name', None)
+            if name is None or grid:
+                name = "-".join([ str(part) for part in [name, len(configurations)] if part is not None ])
+            configurations.append((name, overrides))
+    return configurations
+
+def sweep_jobs(options: dict, configurations: list, output_dir: str) -> list:
+    """ The options of every configuration, the base options with its overrides. """
+    jobs = []
+    for name, overrides in configurations:
+        job_options = copy.deepcopy(options)
+        for key, value in overrides.items():
+            set_option(job_options, key, value)
+        job_options['output_dir'] = path.join(output_dir, name)
+        complete_options(job_options)
+        jobs.append((name, job_options))
+    return jobs
+
+def option_str(value) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    else:
+        return value
+
+def set_option(options: dict, key: str, value):
+    # Dotted keys reach into nested options, as in workload_manager.type
+    parts = key.split(".")
+    for part in parts[:-1]:
+        options = options.setdefault(part, {})
+    options[parts[-1]] = copy.deepcopy(value)
+
+def complete_options(options: dict):
+    options.setdefault('nbtrajectories', '1')
+    options.setdefault('trajectory_origin', '0')
+    options.setdefault('trajectory_length', '0')
+    options.setdefault('workload_manager', {})
+    options['workload_manager'].setdefault('type', "Minimal")
+    options['workload_manager'].setdefault('agent', {})
+
+def simulate_configuration(name: str, options: dict):
+    rnd.seed(options['seed'])
+    np.random.seed(options['seed'])
+    if 'torch' in sys.modules:
+        sys.modules['torch'].manual_seed(options['seed'])
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start_logging(options)
+        simulator = simulate(0, options, library=shared_libraries.get(options.get('platform_file')),
+                             workload=shared_workloads.get(options['workload_file']))
+    logging.shutdown()
+    statistics = {}
+    for metric, values in simulator.get_statistics().items():
+        statistics.update({ metric + "_" + key: value for key, value in values.items() })
+    return output.getvalue(), statistics
+
 def print_statistics(message: str, stats: dict):
 
     total_message = message
@@ -163,13 +493,14 @@ def print_statistics(message: str, stats: dict):
     print(total_message[:-1])
     #print(f"{message} total: {stats['total']}, avg: {stats['avg']}, max: {stats['max']}, min: {stats['min']}")
 
-def start_logging():
-    options = Options().get()
+def start_logging(options: dict, append: bool = False):
+    # Appending to the logs of a resumed simulation, which already have their headers
+    mode = "a" if append else "w"
     levels = { 'DEBUG': logging.DEBUG, 'INFO': logging.INFO }
     if not path.exists(options['output_dir']):
         os.makedirs(options['output_dir'])
     irmasim_logger = logging.getLogger("irmasim")
-    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"irmasim.log", mode="w")
+    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"irmasim.log", mode=mode)
     if 'log_level' in options:
         irmasim_logger.setLevel(levels[options['log_level']])
     else:
@@ -177,23 +508,25 @@ def start_logging():
     irmasim_logger.addHandler(FileOutputHandler)
 
     simulator_logger = logging.getLogger("simulator")
-    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"simulation.log", mode="w")
+    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"simulation.log", mode=mode)
     FileOutputHandler.setFormatter(logging.Formatter(f'run,%(message)s'))
     simulator_logger.setLevel(logging.INFO)
     simulator_logger.addHandler(FileOutputHandler)
-    simulator_logger.info(Simulator.header())
+    if not append:
+        simulator_logger.info(Simulator.header())
     simulator_logger.propagate = False
 
     job_logger = logging.getLogger("jobs")
-    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"jobs.log", mode="w")
+    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"jobs.log", mode=mode)
     FileOutputHandler.setFormatter(logging.Formatter(f'run,%(message)s'))
     job_logger.setLevel(logging.INFO)
     job_logger.addHandler(FileOutputHandler)
-    job_logger.info(Job.header())
+    if not append:
+        job_logger.info(Job.header())
     job_logger.propagate = False
 
     resource_logger = logging.getLogger("resources")
-    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"resources.log", mode="w")
+    FileOutputHandler = logging.FileHandler(options['output_dir']+"/"+"resources.log", mode=mode)
     FileOutputHandler.setFormatter(logging.Formatter(f'run,%(message)s'))
     resource_logger.setLevel(logging.INFO)
     resource_logger.addHandler(FileOutputHandler)
@@ -0,0 +1,117 @@
+import heapq
+import math
+
+
+class Rate:
+    """ Tasks that progress at the same rate. done is the sum, step by step, of the ops run at this rate with the
+    rounding a task applies to its ops, so a task only keeps the value of done at which it has no ops left. """
+
+    __slots__ = ('rate', 'done', 'heap', 'hidden', 'live', 'members')
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.done = 0
+        # Entries are [target, sequence, owner, rate], the owner is None once the entry leaves the heap
+        self.heap = []
+        # Tasks that progress but are not taken into account for the next step
+        self.hidden = []
+        self.live = 0
+        self.members = 0
+
+
+class EventCalendar:
+    """ Progress and completion of the running tasks. The ops left of every task are exactly those obtained
+    decreasing them step by step, as the simulator has always done, which needs the ops run at every rate in use to
+    be rounded at every step. So advance costs O(R), R being the number of rates in use, plus O(log n) per task that
+    runs out of ops. The next step is found in the same pass and kept until the task that gives it is stopped, then
+    get_next_step costs O(R) once more. With contention models almost every task has a rate of its own and R comes
+    close to the number of running tasks. """
+
+    def __init__(self):
+        self.now = 0.0
+        self.previous = 0.0
+        self.rates = {}
+        self.sequence = 0
+        # The next step and the event that gives it, None when it has to be found again
+        self.next_step = math.inf
+        self.next_event = None
+
+    def start(self, owner, ops: int, rate: float, hidden: bool = False):
+        """ Runs ops at the given rate until stop. The owner is returned by advance in the step its ops run out, or
+        never if it is None. Tasks without ops are never taken into account for the next step. """
+        group = self.rates.get(rate)
+        if group is None:
+            group = self.rates[rate] = Rate(rate)
+        group.members += 1
+        event = [group.done + ops, self.sequence, owner, group]
+        self.sequence += 1
+        if owner is not None:
+            if hidden or ops <= 0:
+                heapq.heappush(group.hidden, event)
+            else:
+                heapq.heappush(group.heap, event)
+                if self.next_step is not None and ops / rate < self.next_step:
+                    self.next_step = ops / rate
+                    self.next_event = event
+            group.live += 1
+        return event
+
+    def stop(self, event: list):
+        """ Removes the ops from their rate and returns how many are left. """
+        group = event[3]
+        if event[2] is not None:
+            event[2] = None
+            if event is self.next_event:
+                self.next_step = None
+            group.live -= 1
+            if len(group.heap) + len(group.hidden) > 2 * group.live + 64:
+                group.heap = [entry for entry in group.heap if entry[2] is not None]
+                group.hidden = [entry for entry in group.hidden if entry[2] is not None]
+                heapq.heapify(group.heap)
+                heapq.heapify(group.hidden)
+        group.members -= 1
+        if group.members == 0:
+            del self.rates[group.rate]
+        return event[0] - group.done
+
+    @staticmethod
+    def ops(event: list):
+        return event[0] - event[3].done
+
+    def get_next_step(self):
+        if self.next_step is None:
+            self.next_step = math.inf
+            self.next_event = None
+            for group in self.rates.values():
+                self.find_next_step(group)
+        return self.next_step
+
+    def find_next_step(self, group: Rate):
+        heap = group.heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        if heap:
+            next_step = (heap[0][0] - group.done) / group.rate
+            if next_step < self.next_step:
+                self.next_step = next_step
+                self.next_event = heap[0]
+
+    def advance(self, delta_time: float):
+        """ Runs every rate for delta_time and returns the owners whose ops have run out. Their ops go on decreasing
+        until they are stopped. """
+        due = []
+        self.next_step = math.inf
+        self.next_event = None
+        for group in self.rates.values():
+            group.done += round(group.rate * delta_time)
+            for heap in (group.heap, group.hidden):
+                while heap and (heap[0][2] is None or heap[0][0] <= group.done):
+                    event = heapq.heappop(heap)
+                    if event[2] is not None:
+                        due.append(event[2])
+                        event[2] = None
+                        group.live -= 1
+            self.find_next_step(group)
+        self.previous = self.now
+        self.now += delta_time
+        return due
@@ -0,0 +1,65 @@
+from irmasim.platform.TaskRunner import TaskRunner
+from irmasim.platform.Resource import Resource
+from irmasim.platform.EventCalendar import EventCalendar
+from irmasim.Task import Task
+
+
+class Platform(TaskRunner):
+
+    def __init__(self, id: str, config: dict):
+        super(Platform, self).__init__(id=id, config=config)
+        self.set_calendar(EventCalendar())
+        self.power = 0
+        # Dense integer handles, resources are looked up by handle or by full id in constant time
+        self.resources = []
+        self.handles = {}
+        self.register(self)
+
+    def add_child(self, child: TaskRunner):
+        super().add_child(child)
+        child.set_calendar(self.calendar)
+        self.power += child.get_power()
+        self.register(child)
+
+    def register(self, resource: Resource):
+        resource.path = tuple(resource.full_id())
+        resource.handle = len(self.resources)
+        self.resources.append(resource)
+        self.handles[resource.path] = resource.handle
+        for child in resource.children:
+            self.register(child)
+
+    def get_handle(self, resource_id: list):
+        try:
+            return self.handles[tuple(resource_id)]
+        except KeyError:
+            raise Exception(f"Resource {'.'.join(resource_id)} does not belong to platform {self.id}")
+
+    def get_resource_by_handle(self, handle: int):
+        return self.resources[handle]
+
+    def schedule(self, task: Task):
+        # Only the resource running the task is visited, its ancestors are told on the way up
+        resource = self.resources[task.handle]
+        resource.schedule(task)
+        resource.parent.task_scheduled(task, resource)
+
+    def reap(self, task: Task):
+        resource = self.resources[task.handle]
+        resource.reap(task)
+        resource.parent.task_reaped(task, resource)
+
+    def get_next_step(self):
+        return self.calendar.get_next_step()
+
+    def advance(self, delta_time: float):
+        return [runner.complete_task() for runner in self.calendar.advance(delta_time)]
+
+    def get_joules(self, delta_time: float):
+        return self.power * delta_time
+
+    def get_power(self):
+        return self.power
+
+    def power_changed(self, delta_power: float):
+        self.power += delta_power
@@ -4,19 +4,24 @@ class Resource:
         self.id = id
         self.config = config
         self.children = []
+        self.children_by_id = {}
         self.parent = None
+        # Set when the resource is registered in its platform
+        self.handle = None
+        self.path = None
 
     def find_child(self, id: str):
-        for child in self.children:
-            if child.id == id:
-                return child
-        raise Exception("Resource " + self.id + " does not have child " + id)
+        try:
+            return self.children_by_id[id]
+        except KeyError:
+            raise Exception("Resource " + self.id + " does not have child " + id)
 
     def get_parent(self):
         return self.parent
 
     def add_child(self, child: "Resource"):
         self.children.append(child)
+        self.children_by_id.setdefault(child.id, child)
         child.parent = self
 
     def enumerate_ids(self,parent_id: list = []):
@@ -65,6 +70,8 @@ class Resource:
             return [1]
 
     def full_id(self):
+        if self.path is not None:
+            return list(self.path)
         if self.parent != None:
             id=self.parent.full_id()
             id.append(self.id)
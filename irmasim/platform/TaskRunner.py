@@ -2,36 +2,48 @@ from irmasim.platform.Resource import Resource
 from irmasim.platform.EnergyConsumer import EnergyConsumer
 from irmasim.Task import Task
 import math
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from irmasim.platform.EventCalendar import EventCalendar
 
 class TaskRunner(Resource, EnergyConsumer):
 
     def __init__(self, id: str, config: dict):
         super(TaskRunner, self).__init__(id=id, config=config)
+        self.calendar = None
 
-    def schedule(self, task: Task, resource_id: list):
-        try:
-            child = self.find_child(resource_id.pop(0))
-            child.schedule(task, resource_id)
-        except IndexError:
-            raise Exception('Cannot schedule a task to an empty id')
+    def set_calendar(self, calendar: "EventCalendar"):
+        self.calendar = calendar
+        for child in self.children:
+            child.set_calendar(calendar)
+
+    def schedule(self, task: Task):
+        raise Exception(f"Resource {self.id} does not run tasks")
+
+    def task_scheduled(self, task: Task, child: 'TaskRunner'):
+        if self.parent is not None:
+            self.parent.task_scheduled(task, self)
 
     def get_next_step(self):
         return min([child.get_next_step() for child in self.children if child.get_next_step() > 0] or [math.inf])
 
-    def advance(self, delta_time: float):
-        for child in self.children:
-            child.advance(delta_time)
+    def reap(self, task: Task):
+        raise Exception(f"Resource {self.id} does not run tasks")
 
-    def reap(self, task: Task, resource_id: list):
-        try:
-            child = self.find_child(resource_id.pop(0))
-            child.reap(task, resource_id)
-        except IndexError:
-            raise Exception('Cannot reap a task from an empty id')
+    def task_reaped(self, task: Task, child: 'TaskRunner'):
+        if self.parent is not None:
+            self.parent.task_reaped(task, self)
 
     def get_joules(self, delta_time: float):
         return sum([child.get_joules(delta_time) for child in self.children])
 
+    def get_power(self):
+        return sum([child.get_power() for child in self.children])
+
+    def power_changed(self, delta_power: float):
+        if self.parent is not None:
+            self.parent.power_changed(delta_power)
+
     @classmethod
     def header(klass):
         return "Logging of this kind of resource has not been implemented"
@@ -0,0 +1,32 @@
+from irmasim.platform.models.modelV1.Core import Core
+from irmasim.Task import Task
+import numpy
+
+
+class ArrayCore (Core):
+    """ Core of an ArrayProcessor, mirrors its state into the arrays of the processor. """
+
+    def __init__(self, id: list, config: dict):
+        super(ArrayCore, self).__init__(id=id, config=config)
+
+    def schedule(self, task: Task):
+        super().schedule(task)
+        self.parent.bandwidths[self.index] = self.requested_memory_bandwidth
+        self.parent.busy[self.index] = True
+        self.parent.running[self.index] = not task.finished
+        # Forces the next evaluation of the processor to start the task
+        self.parent.speedups[self.index] = numpy.nan
+
+    def complete_task(self):
+        task = super().complete_task()
+        self.parent.bandwidths[self.index] = 0.0
+        self.parent.running[self.index] = False
+        return task
+
+    def reap(self, task: Task):
+        super().reap(task)
+        self.speedup = 1
+        self.parent.bandwidths[self.index] = 0.0
+        self.parent.busy[self.index] = False
+        self.parent.running[self.index] = False
+        self.parent.speedups[self.index] = 1.0
@@ -0,0 +1,62 @@
+from irmasim.platform.models.modelV1.Processor import Processor
+from irmasim.platform.models.modelV1.ContentionTable import ContentionTable
+from irmasim.platform.BasicCore import BasicCore
+import numpy
+
+
+class ArrayProcessor (Processor):
+    """ Processor that keeps the state of its cores in arrays and evaluates speedup and power on all of them at once.
+
+    The arithmetic follows Processor operation by operation, and sums are done in core order, so both give the
+    same results. """
+
+    def __init__(self, id: list, config: dict, contention: ContentionTable = None):
+        cores = config['cores']
+        self.bandwidths = numpy.zeros(cores)
+        self.busy = numpy.zeros(cores, dtype=bool)
+        self.running = numpy.zeros(cores, dtype=bool)
+        self.speedups = numpy.ones(cores)
+        self.dynamic_powers = numpy.zeros(cores)
+        self.total_idle_power = 0
+        self.total_static_power = 0
+        super(ArrayProcessor, self).__init__(id=id, config=config, contention=contention)
+
+    def add_child(self, child: BasicCore):
+        super().add_child(child)
+        self.dynamic_powers[child.index] = child.dynamic_power
+        self.total_idle_power += child.min_power*child.static_power
+        self.total_static_power += child.static_power
+
+    def update_speedup(self):
+        self.requested_memory_bandwidth = sum(self.bandwidths.tolist())
+        indices = numpy.flatnonzero(self.busy)
+        if indices.size == 0:
+            return
+        speedups = self.round(self.contention.speedups(self.requested_memory_bandwidth, self.bandwidths[indices],
+                                                       int(numpy.count_nonzero(self.running)) - 1))
+        changed = speedups != self.speedups[indices]
+        indices = indices[changed]
+        speedups = speedups[changed]
+        self.speedups[indices] = speedups
+        for index, speedup in zip(indices.tolist(), speedups.tolist()):
+            core = self.children[index]
+            core.speedup = speedup
+            core.update_event()
+
+    @staticmethod
+    def round(speedups: numpy.ndarray):
+        # Same as round(speedup, 9), the quotient of two exact integers is correctly rounded. Only values too close
+        # to a tie for the product to tell which way it goes are rounded one by one.
+        scaled = speedups * 1e9
+        rounded = numpy.rint(scaled) / 1e9
+        for index in numpy.flatnonzero(numpy.abs(scaled - numpy.floor(scaled) - 0.5) < 1e-6).tolist():
+            rounded[index] = round(float(speedups[index]), 9)
+        return rounded
+
+    def update_power(self):
+        power_consumption = self.power_consumption
+        if not self.busy.any():
+            self.power_consumption = self.total_idle_power
+        else:
+            self.power_consumption = sum(self.dynamic_powers[self.busy].tolist()) + self.total_static_power
+        self.power_changed(self.power_consumption - power_consumption)
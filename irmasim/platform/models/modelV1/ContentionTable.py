@@ -0,0 +1,76 @@
+import math
+import numpy
+
+
+class ContentionTable:
+    """ Memory contention curve of a processor type.
+
+    The terms that depend on the number of co-runners are computed once per type. With a positive error the
+    smoothstep is also tabulated and read by linear interpolation, the table is sized so that speedups stay within
+    the error of the exact curve.
+
+    Only the smoothstep is tabulated because it is the only non-linear part of the curve. Its argument is an affine
+    function of the core bandwidth whose coefficients depend on the co-runners. The result is then scaled and
+    offset by per co-runner terms and compared with a line in the total bandwidth. All of these are exact with the
+    precomputed terms. A table over (total bandwidth, core bandwidth, co-runners) would only add interpolation error
+    in the linear parts, and memory for every co-runner count. """
+
+    # Maximum of |ss''| over [0, 1], the curvature that bounds the interpolation error
+    CURVATURE = 10 / math.sqrt(3)
+
+    def __init__(self, config: dict, error: float = 0.0):
+        self.b = config['b']
+        self.c = config['c']
+        # Indexed by co-runners + 1, a processor with finished but not reaped tasks may have -1 co-runners
+        runners = range(-1, config['cores'])
+        self.offsets = [(config['da'] - n) * config['db'] for n in runners]
+        self.divisors = [config['dc'] - n * config['dd'] for n in runners]
+        self.weights = [n * 0.6 / (1 + n * 0.6) for n in runners]
+        self.bases = [1 / (1 + n * 0.6) for n in runners]
+        self.error = 0.0
+        self.grid = None
+        if error > 0:
+            error = error / max([abs(weight) for weight in self.weights])
+            points = math.ceil(1 / math.sqrt(8 * error / self.CURVATURE)) + 1
+            self.grid = numpy.linspace(0.0, 1.0, points)
+            self.table = self.smoothstep(self.grid)
+            self.step = 1 / (points - 1)
+            self.error = self.CURVATURE * self.step * self.step / 8 * max([abs(weight) for weight in self.weights])
+
+    @staticmethod
+    def smoothstep(x):
+        return 1 - x * x * x * (x * (x * 6 - 15) + 10)
+
+    def ss(self, x: float):
+        if x < 0:
+            return 1
+        elif x > 1:
+            return 0
+        elif self.grid is None:
+            return self.smoothstep(x)
+        else:
+            position = x / self.step
+            i = min(int(position), len(self.table) - 2)
+            return self.table[i] + (position - i) * (self.table[i + 1] - self.table[i])
+
+    def speedup(self, x: float, y: float, n: int):
+        if x < self.c:
+            return 1
+        i = n + 1
+        d = self.ss((y - self.offsets[i]) / self.divisors[i]) * self.weights[i] + self.bases[i]
+        if x > ((d + self.b * self.c - 1) / self.b):
+            return d
+        else:
+            return self.b * (x - self.c) + 1
+
+    def speedups(self, x: float, y: numpy.ndarray, n: int):
+        if x < self.c:
+            return numpy.ones(y.size)
+        i = n + 1
+        aux = (y - self.offsets[i]) / self.divisors[i]
+        if self.grid is None:
+            aux = numpy.where(aux < 0, 1.0, numpy.where(aux > 1, 0.0, self.smoothstep(aux)))
+        else:
+            aux = numpy.interp(aux, self.grid, self.table)
+        d = aux * self.weights[i] + self.bases[i]
+        return numpy.where(x > ((d + self.b * self.c - 1) / self.b), d, self.b * (x - self.c) + 1)
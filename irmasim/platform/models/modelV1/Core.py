@@ -20,12 +20,13 @@ class Core(BasicCore):
         self.mops = self.clock_rate * config['dpflops_per_cycle'] * 1e3
         self.speedup = 1.0
         self.task = None
+        self.index = None
         self.requested_memory_bandwidth = 0.0
 
     def get_mops(self):
         return self.mops
 
-    def schedule(self, task: Task, resource_id: list):
+    def schedule(self, task: Task):
         if self.task is not None:
             raise Exception("This core does not model oversubscription")
 
@@ -39,15 +40,20 @@ class Core(BasicCore):
         else:
             return self.task.ops / (self.mops * 1e6 * self.speedup)
 
-    def advance(self, delta_time: float):
+    def update_event(self):
         if self.task is not None:
-            self.task.advance(delta_time, self.mops * 1e6 * self.speedup * delta_time)
-            if self.task.ops <= 0.0:
-                self.requested_memory_bandwidth = 0
+            self.task.run(self, self.mops * 1e6 * self.speedup, self.calendar)
 
-    def reap(self, task: Task, resource_id: list):
+    def complete_task(self):
+        # The task has run out of ops, it goes on running until it is reaped
+        self.task.complete(self.calendar)
+        self.requested_memory_bandwidth = 0
+        return self.task
+
+    def reap(self, task: Task):
         if self.task is None or self.task != task:
             raise Exception("Cannot reap task from resource")
+        task.stop(self.calendar)
         self.task = None
         self.requested_memory_bandwidth = 0
 
@@ -2,7 +2,10 @@ from irmasim.platform.models.modelV1.Cluster import Cluster
 from irmasim.platform.models.modelV1.Node import Node
 from irmasim.platform.models.modelV1.Processor import Processor
 from irmasim.platform.models.modelV1.Core import Core
-from irmasim.platform.TaskRunner import TaskRunner
+from irmasim.platform.models.modelV1.ArrayProcessor import ArrayProcessor
+from irmasim.platform.models.modelV1.ArrayCore import ArrayCore
+from irmasim.platform.models.modelV1.ContentionTable import ContentionTable
+from irmasim.platform.Platform import Platform
 
 
 class ModelBuilder:
@@ -11,14 +14,20 @@ class ModelBuilder:
         if builder is not None:
             self.platform_description = builder.platform_description
             self.library = builder.library
+            self.contention_tables = builder.contention_tables
         else:
             self.platform_description = platform_description
             self.library = library
+            self.contention_tables = {}
 
     def build_platform(self):
-        platform = TaskRunner(self.platform_description["id"], { "model": "modelV1" } )
+        platform = Platform(self.platform_description["id"], { "model": "modelV1" } )
         builder = ClusterBuilder(builder=self)
         self.build_children(builder, self.platform_description, platform, "clusters", "cluster")
+        tables = [table for table in self.contention_tables.values() if table.grid is not None]
+        if tables:
+            print(f'Using speedup tables of {max([len(table.grid) for table in tables])} points, '
+                  f'maximum error {max([table.error for table in tables]):g}')
         return platform
 
     def build_resource(self, id: str, definition: dict):
@@ -74,8 +83,15 @@ class ProcessorBuilder(ModelBuilder):
                                                library=library, builder=builder)
 
     def build_resource(self, id: str, definition: dict):
-        definition = self.library["processor"][definition["type"]]
-        resource = Processor(id, definition)
+        processor_type = definition["type"]
+        definition = self.library["processor"][processor_type]
+        if processor_type not in self.contention_tables:
+            self.contention_tables[processor_type] = ContentionTable(definition,
+                                                           float(self.platform_description.get("speedup_error", 0.0)))
+        if self.platform_description.get("engine", "objects") == "arrays":
+            resource = ArrayProcessor(id, definition, self.contention_tables[processor_type])
+        else:
+            resource = Processor(id, definition, self.contention_tables[processor_type])
         builder = CoreBuilder(builder=self)
         for i in range(definition["cores"]):
             child = builder.build_resource("core" + str(i), definition)
@@ -91,4 +107,7 @@ class CoreBuilder(ModelBuilder):
                                           library=library, builder=builder)
 
     def build_resource(self, id: str, definition: dict):
-        return Core(id, definition)
+        if self.platform_description.get("engine", "objects") == "arrays":
+            return ArrayCore(id, definition)
+        else:
+            return Core(id, definition)
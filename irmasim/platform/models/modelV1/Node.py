@@ -9,16 +9,20 @@ class Node (BasicNode):
         super(Node, self).__init__(id=id, config=config)
         self.current_memory = 0
         self.core_count = 0
+        self.idle_core_count = 0
+        self.core_list = []
 
     def add_child(self, child: BasicProcessor):
         super().add_child(child)
         self.core_count += len([ 1 for core in child.children ])
+        self.idle_core_count += child.count_idle_cores()
+        self.core_list.extend(child.children)
 
     def cores(self):
-        return [ core for processor in self.children for core in processor.children ]
+        return self.core_list
 
     def count_idle_cores(self):
-        return len([ 1 for core in self.cores() if core.task is None ])
+        return self.idle_core_count
 
     def max_power_consumption(self):
         return sum([ processor.max_power_consumption for processor in self.children ])
@@ -26,14 +30,18 @@ class Node (BasicNode):
     def idle_cores(self):
         cores = []
         for processor in self.children:
-            cores.extend([ core for core in processor.children if core.task is None  ])
+            cores.extend(processor.idle_cores())
         return cores
+
+    def first_idle_core(self):
+        if self.idle_core_count > 0:
+            for processor in self.children:
+                if processor.idle:
+                    return processor.first_idle_core()
+        return None
     
     def count_cores(self):
-        cores = 0
-        for processor in self.children:
-            cores += sum([ 1 for core in processor.children ])
-        return cores
+        return self.core_count
 
     def running_jobs(self):
         jobs = []
@@ -41,13 +49,15 @@ class Node (BasicNode):
             jobs.extend([ core.task.job for core in processor.children if core.task is not None])
         return jobs
 
-    def schedule(self, task: Task, resource_id: list):
-        super().schedule(task, resource_id)
+    def task_scheduled(self, task: Task, processor: BasicProcessor):
         self.current_memory += task.job.memory
+        self.idle_core_count -= 1
+        super().task_scheduled(task, processor)
 
-    def reap(self, task: Task, resource_id: list):
-        super().reap(task, resource_id)
+    def task_reaped(self, task: Task, processor: BasicProcessor):
         self.current_memory -= task.job.memory
+        self.idle_core_count += 1
+        super().task_reaped(task, processor)
 
     @classmethod
     def header(klass):
@@ -1,75 +1,79 @@
 from irmasim.platform.BasicProcessor import BasicProcessor
 from irmasim.platform.BasicCore import BasicCore
+from irmasim.platform.models.modelV1.ContentionTable import ContentionTable
 from irmasim.Task import Task
+from sortedcontainers import SortedList
 
 
 class Processor (BasicProcessor):
 
-    def __init__(self, id: list, config: dict):
+    def __init__(self, id: list, config: dict, contention: ContentionTable = None):
         super(Processor, self).__init__(id=id, config=config)
+        self.contention = contention if contention is not None else ContentionTable(config)
         self.mops_per_core = config['clock_rate'] * config['dpflops_per_cycle'] * 1e3
         self.requested_memory_bandwidth = 0.0
         self.power_consumption = 0.0
         self.max_power_consumption = 0.0
+        # Indices of the idle cores, the lowest one is the first idle core
+        self.idle = SortedList()
         self.update_power()
 
     def add_child(self, child: BasicCore):
         super().add_child(child)
+        child.index = len(self.children) - 1
+        self.idle.add(child.index)
         self.max_power_consumption += child.dynamic_power + child.static_power
 
-    def schedule(self, task: Task, resource_id: list):
-        super().schedule(task, resource_id)
+    def task_scheduled(self, task: Task, core: BasicCore):
+        self.idle.remove(core.index)
         self.update_speedup()
         self.update_power()
+        super().task_scheduled(task, core)
 
-    def advance(self, delta_time: float):
-        super().advance(delta_time)
-
-    def reap(self, task: Task, resource_id: list):
-        super().reap(task, resource_id)
+    def task_reaped(self, task: Task, core: BasicCore):
+        self.idle.add(core.index)
         self.update_speedup()
         self.update_power()
+        super().task_reaped(task, core)
 
-    def get_joules(self, delta_time: float):
-        return self.power_consumption * delta_time
+    def count_idle_cores(self):
+        return len(self.idle)
 
-    def update_speedup(self):
+    def idle_cores(self):
+        return [ self.children[index] for index in self.idle ]
 
-        def ss(x):
-            if x < 0:
-                return 1
-            elif x > 1:
-                return 0
-            else:
-                return 1 - x * x * x * (x * (x * 6 - 15) + 10)
+    def first_idle_core(self):
+        if self.idle:
+            return self.children[self.idle[0]]
+        else:
+            return None
 
-        def d(y, n):
-            aux = (y - (core.da - n) * core.db) / (core.dc - n * core.dd)
-            aux = ss(aux)
-            return aux * (n * 0.6 / (1 + n * 0.6)) + 1 / (1 + n * 0.6)
+    def get_joules(self, delta_time: float):
+        return self.power_consumption * delta_time
 
-        def perf(x, y, n):
-            if x < core.c:
-                return 1
-            elif x > ((d(y, n) + core.b * core.c - 1) / core.b):
-                return d(y, n)
-            else:
-                return core.b * (x - core.c) + 1
+    def get_power(self):
+        return self.power_consumption
 
+    def update_speedup(self):
         self.requested_memory_bandwidth = sum([core.requested_memory_bandwidth for core in self.children])
-        task_count = sum([1 for core in self.children if core.task is not None and core.task.ops > 0.0])
+        task_count = sum([1 for core in self.children if core.task is not None and not core.task.finished])
         for core in self.children:
             if core.task is not None:
-                core.speedup = round(perf(self.requested_memory_bandwidth, core.requested_memory_bandwidth,
-                                  task_count - 1), 9)
+                speedup = round(self.contention.speedup(self.requested_memory_bandwidth,
+                                                        core.requested_memory_bandwidth, task_count - 1), 9)
+                if speedup != core.speedup or core.task.event is None:
+                    core.speedup = speedup
+                    core.update_event()
             else:
                 # Avoid speedup 0.9999
                 core.speedup = 1
 
     def update_power(self):
+        power_consumption = self.power_consumption
         task_count = sum([1 for core in self.children if core.task is not None])
         if task_count == 0:
             self.power_consumption = sum([(core.min_power*core.static_power) for core in self.children])
         else:
             self.power_consumption = (sum([core.dynamic_power for core in self.children if core.task is not None]) +
                                       sum([core.static_power for core in self.children]))
+        self.power_changed(self.power_consumption - power_consumption)
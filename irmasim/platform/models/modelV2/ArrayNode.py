@@ -0,0 +1,65 @@
+from irmasim.platform.models.modelV2.Node import Node, Process
+from irmasim.Task import Task
+import numpy
+
+
+class ArrayNode (Node):
+    """ Node that keeps the bandwidth and speedup of its processes in arrays and evaluates the contention model
+    for all of them in one call. Processes are stored in slots, a reaped process is replaced by the last one. """
+
+    def __init__(self, id: list, config: dict):
+        super(ArrayNode, self).__init__(id=id, config=config)
+        self.bandwidths = numpy.zeros(8)
+        self.speedups = numpy.zeros(8)
+
+    def schedule(self, task: Task):
+        process = Process(self, task)
+        process.index = task.slot = len(self.processes)
+        if process.index == self.bandwidths.size:
+            self.bandwidths = numpy.concatenate((self.bandwidths, numpy.zeros(self.bandwidths.size)))
+            self.speedups = numpy.concatenate((self.speedups, numpy.zeros(self.speedups.size)))
+        self.processes.append(process)
+        self.bandwidths[process.index] = process.requested_memory_bandwidth
+        # Forces the first evaluation to schedule the completion of the process
+        self.speedups[process.index] = numpy.nan
+        self.requested_memory_bandwidth += process.requested_memory_bandwidth
+        self.update_speedup()
+        self.update_power()
+
+    def reap(self, task: Task):
+        process = self.processes[task.slot]
+        last = self.processes.pop()
+        if last is not process:
+            last.index = last.task.slot = process.index
+            self.processes[last.index] = last
+            self.bandwidths[last.index] = self.bandwidths[len(self.processes)]
+            self.speedups[last.index] = self.speedups[len(self.processes)]
+        task.slot = None
+        task.stop(self.calendar)
+        self.requested_memory_bandwidth -= process.requested_memory_bandwidth
+        if task.finished:
+            self.zombie_removed()
+        self.update_speedup()
+        self.update_power()
+
+    def update_speedup(self):
+        count = len(self.processes)
+        if count == 0:
+            return
+        other = count - 1
+        all_bw = self.requested_memory_bandwidth*1e-3
+        int_bw = self.bandwidths[:count]*1e-3
+
+        a = (self.abb + other * self.aba) + int_bw * (self.aab + other * self.aaa)
+        b = (self.bbb + other * self.bba) + int_bw * (self.bab + other * self.baa)
+        c = (self.ccb + other * self.cca) + int_bw * (self.cbb + other * self.cba) + \
+            int_bw**2 * (self.cab + other * self.caa)
+        d = (self.dbb + other * self.dba) + int_bw * (self.dab + other * self.daa)
+
+        speedups = b+(c-b)*numpy.exp(-numpy.exp(a*(all_bw-d)))*0.9
+        changed = numpy.flatnonzero(speedups != self.speedups[:count])
+        self.speedups[:count] = speedups
+        for index in changed.tolist():
+            process = self.processes[index]
+            process.speedup = float(speedups[index])
+            process.update_event()
@@ -1,6 +1,7 @@
 from irmasim.platform.models.modelV2.Cluster import Cluster
 from irmasim.platform.models.modelV2.Node import Node
-from irmasim.platform.TaskRunner import TaskRunner
+from irmasim.platform.models.modelV2.ArrayNode import ArrayNode
+from irmasim.platform.Platform import Platform
 
 class ModelBuilder:
 
@@ -13,7 +14,7 @@ class ModelBuilder:
             self.library = library
 
     def build_platform(self):
-        platform = TaskRunner(self.platform_description["id"], { "model": "modelV2" } )
+        platform = Platform(self.platform_description["id"], { "model": "modelV2" } )
         builder = ClusterBuilder(builder=self)
         self.build_children(builder, self.platform_description, platform, "clusters", "cluster")
         return platform
@@ -58,5 +59,8 @@ class NodeBuilder(ModelBuilder):
 
     def build_resource(self, id: str, definition: dict):
         definition = self.library["node"][definition["type"]]
-        resource = Node(id, definition)
+        if self.platform_description.get("engine", "objects") == "arrays":
+            resource = ArrayNode(id, definition)
+        else:
+            resource = Node(id, definition)
         return resource
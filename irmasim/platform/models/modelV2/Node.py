@@ -34,14 +34,22 @@ class Process:
         c = cc + int_bw * cb + int_bw**2 * ca
         d = db + int_bw * da
 
-        self.speedup = b+(c-b)*math.exp(-math.exp(a*(all_bw-d)))*0.9
+        speedup = b+(c-b)*math.exp(-math.exp(a*(all_bw-d)))*0.9
+        if speedup != self.speedup or self.task.event is None:
+            self.speedup = speedup
+            self.update_event()
+
+    def update_event(self):
+        self.task.run(self, self.node.gops * 1e9 * self.speedup, self.node.calendar, self.node.zombies > 0)
+
+    def complete_task(self):
+        self.task.complete(self.node.calendar)
+        self.node.zombie_added()
+        return self.task
 
     def get_next_step(self):
             return self.task.ops / (self.node.gops * 1e9 * self.speedup)
 
-    def advance(self, delta_time: float):
-        self.task.advance(delta_time, self.node.gops * 1e9 * self.speedup * delta_time)
-
 class Node (BasicNode):
 
     def __init__(self, id: list, config: dict):
@@ -77,12 +85,17 @@ class Node (BasicNode):
         self.p20 = config['p20']
 
         self.requested_memory_bandwidth = 0
+        # Processes that ran out of ops and have not been reaped yet, the node has no next step meanwhile
+        self.zombies = 0
+        self.power_consumption = 0.0
+        self.update_power()
 
-    def schedule(self, task: Task, resource_id: list):
+    def schedule(self, task: Task):
         process = Process(self,task)
         self.processes.append(process)
         self.requested_memory_bandwidth += process.requested_memory_bandwidth
         self.update_speedup()
+        self.update_power()
 
     def get_next_step(self):
         if self.processes == []:
@@ -90,29 +103,53 @@ class Node (BasicNode):
         else:
             return min([process.get_next_step() for process in self.processes])
 
-    def advance(self, delta_time: float):
-        for process in self.processes:
-            process.advance(delta_time)
-
-    def reap(self, task: Task, resource_id: list):
+    def reap(self, task: Task):
         for process in self.processes:
             if process.task == task:
                 self.processes.remove(process)
+                task.stop(self.calendar)
                 self.requested_memory_bandwidth -= process.requested_memory_bandwidth
+                if task.finished:
+                    self.zombie_removed()
                 break
         self.update_speedup()
+        self.update_power()
 
     def update_speedup(self):
         for process in self.processes:
             process.update_speedup()
+
+    def zombie_added(self):
+        self.zombies += 1
+        if self.zombies == 1:
+            self.update_events()
+
+    def zombie_removed(self):
+        self.zombies -= 1
+        if self.zombies == 0:
+            self.update_events()
+
+    def update_events(self):
+        # Processes that have just run out of ops are about to be completed
+        for process in self.processes:
+            if process.task.ops > 0:
+                process.update_event()
         
-    def get_joules(self, delta_time: float):
+    def update_power(self):
+        power_consumption = self.power_consumption
         job_count = len(self.processes)
         if job_count == 0:
-            return self.pidle*delta_time
-        all_bw=self.requested_memory_bandwidth*1e-3
-        p = self.p00 + \
-            self.p10 * all_bw + self.p20 * all_bw**2 + \
-            self.p01 * job_count + self.p02 * job_count**2 + \
-            self.p11 * all_bw * job_count 
-        return p*delta_time
+            self.power_consumption = self.pidle
+        else:
+            all_bw=self.requested_memory_bandwidth*1e-3
+            self.power_consumption = self.p00 + \
+                self.p10 * all_bw + self.p20 * all_bw**2 + \
+                self.p01 * job_count + self.p02 * job_count**2 + \
+                self.p11 * all_bw * job_count
+        self.power_changed(self.power_consumption - power_consumption)
+
+    def get_joules(self, delta_time: float):
+        return self.power_consumption*delta_time
+
+    def get_power(self):
+        return self.power_consumption
@@ -3,10 +3,8 @@ from irmasim.Job import Job
 from irmasim.Task import Task
 from irmasim.platform.BasicNode import BasicNode
 from typing import TYPE_CHECKING
-from irmasim.Options import Options
 from sortedcontainers import SortedList
 import importlib
-import random as rand
 
 if TYPE_CHECKING:
     from irmasim.Simulator import Simulator
@@ -16,7 +14,7 @@ class Backfill(WorkloadManager):
         super(Backfill, self).__init__(simulator)
         if simulator.platform.config["model"] != "modelV1":
             raise Exception("Backfill workload manager needs a modelV1 platform")
-        options = Options().get()
+        options = simulator.options
 
         self.pending_jobs = []
         self.running_jobs = []
@@ -37,10 +35,10 @@ class Backfill(WorkloadManager):
             'high_mem': lambda node: - node.current_memory,
             'high_mem_bw': lambda node: node.children[0].requested_memory_bandwidth,
             'low_power': lambda node: (node.children[0].children[0].static_power + node.children[0].children[0].dynamic_power) * node.count_cores(),
-            'energy_lowest': lambda node, job: self.node_energy(job, node),
-            'energy_highest': lambda node, job: -self.node_energy(job, node),
-            'edp_lowest': lambda node, job: self.node_edp(job, node),
-            'edp_highest': lambda node, job: -self.node_edp(job, node)
+            'energy_lowest': self.lowest_energy,
+            'energy_highest': self.highest_energy,
+            'edp_lowest': self.lowest_edp,
+            'edp_highest': self.highest_edp
         }
 
         self.node_sort_key = node_selections[self.node_scheduler]
@@ -96,12 +94,12 @@ class Backfill(WorkloadManager):
                 self.idle_nodes.sort(key=self.node_sort_key)
             return self.idle_nodes
         else:
-            rand.shuffle(self.idle_nodes)
+            self.simulator.random.shuffle(self.idle_nodes)
             return self.idle_nodes
         
     def try_allocate_first_job(self, idle_nodes_ordered):
         for node in idle_nodes_ordered:
-            if node.count_idle_cores() >= len(self.pending_jobs[0].tasks):
+            if node.count_idle_cores() >= self.pending_jobs[0].ntasks:
                 next_job = self.pending_jobs.pop(0)
                 self.allocate(node, next_job)
                 return True
@@ -111,7 +109,7 @@ class Backfill(WorkloadManager):
         for job in self.pending_jobs.copy()[1:]:
             for node in self.idle_nodes.copy():
                 # Optimization: If the job does not fit in the node, do not check backfill
-                if len(job.tasks) > node.count_cores():
+                if job.ntasks > node.count_cores():
                     continue
                 # If the node is empty, backfill with the job (this will not affect the blocked job)
                 if node.count_idle_cores() == node.count_cores():
@@ -139,14 +137,14 @@ class Backfill(WorkloadManager):
                 idle_nodes_ordered = self.idle_nodes
                 #print(f"Nodo:", [node.id for node in idle_nodes_ordered])
             else: 
-                idle_nodes_ordered =  rand.shuffle(self.idle_nodes) 
+                idle_nodes_ordered =  self.simulator.random.shuffle(self.idle_nodes) 
 
             #for node in idle_nodes_ordered:
                 #print(f"Nodo: {node.id} free: {node.count_idle_cores()} / {node.count_cores()}")
 
             for node in self.idle_nodes:
                 #print(f"Nodo:",node.id ,"free:", node.count_idle_cores(), "pending_job[0] tasks:", len(self.pending_jobs[0].tasks))
-                if node.count_idle_cores() >= len(self.pending_jobs[0].tasks):
+                if node.count_idle_cores() >= self.pending_jobs[0].ntasks:
                     next_job = self.pending_jobs.pop(0)
                     #print(f"job: ", next_job.name, "future jobs:", len(self.pending_jobs))
                     #print(f"ENTRA PRIMERO", next_job.name)
@@ -162,7 +160,7 @@ class Backfill(WorkloadManager):
                 #print(f"Probando backfill para el job: {job.name} con {len(job.tasks)} tasks")
                 for node in self.idle_nodes.copy():
                     # Optimización: Si el job no cabe en el nodo, no se comprueba el backfill
-                    if len(job.tasks) > node.count_cores():
+                    if job.ntasks > node.count_cores():
                         continue
                     #print(f"en el nodo: {node.id} libres: {node.count_idle_cores()} / {node.count_cores()}")
                     # Si el nodo esta vacio, hace backfill con el job
@@ -195,9 +193,8 @@ class Backfill(WorkloadManager):
         pass    
 
     def allocate(self, node: BasicNode, job: Job):
-            cores = node.idle_cores() 
-            for task in job.tasks:
-                task.allocate(cores.pop(0).full_id())
+            for task, core in zip(job.tasks, node.idle_cores()):
+                task.allocate(core.full_id(), core.handle)
 
             self.simulator.schedule(job.tasks)
             self.running_jobs.append(job)
@@ -208,7 +205,7 @@ class Backfill(WorkloadManager):
             self.assigned_nodes[node.id] += 1
 
     def deallocate(self, task: Task):
-        core = self.simulator.get_resource(list(task.resource))
+        core = self.simulator.platform.get_resource_by_handle(task.handle)
         node = core.parent.parent
         #print(f"node : ", node)
         if node in self.busy_nodes:
@@ -232,18 +229,18 @@ class Backfill(WorkloadManager):
         extra_nodes = 0
         for i in range(len(running_jobs_eet)): #Busco el start time del next job que es = estimated end time de algun running job
             #print(f"idle_cores_after_end_job:", idle_cores_after_end_job, "pending_jobs:", len(self.pending_jobs[0].tasks))
-            idle_cores_after_end_job += len(running_jobs_eet[i].tasks) # Sumo los cores que se liberan al finalizar el job
-            if idle_cores_after_end_job >= len(self.pending_jobs[0].tasks): # Si hay suficientes cores para el job bloqueante 
+            idle_cores_after_end_job += running_jobs_eet[i].ntasks # Sumo los cores que se liberan al finalizar el job
+            if idle_cores_after_end_job >= self.pending_jobs[0].ntasks: # Si hay suficientes cores para el job bloqueante 
                 #print(f"limit job: ", running_jobs_eet[i].name)
                 #print(f"limmit job: ", running_job.name)
                 blocking_job_start_point = running_jobs_eet[i].start_time + running_jobs_eet[i].req_time # Start point del job bloqueante
                 #print(f"start point: ", blocking_job_start_point)
                 break
 
-        extra_nodes = node.count_cores() -  len(self.pending_jobs[0].tasks)
+        extra_nodes = node.count_cores() -  self.pending_jobs[0].ntasks
         #print(f"extra_nodes:", extra_nodes, "running_jobs_eet[i+1:]:", [job.name for job in running_jobs_eet[i+1:]])
         for job in running_jobs_eet[i+1:]: 
-            extra_nodes -= len(job.tasks)
+            extra_nodes -= job.ntasks
 
 
         return blocking_job_start_point, extra_nodes
@@ -256,14 +253,26 @@ class Backfill(WorkloadManager):
         #print(f"shadow_time:", shadow_time, "extra_nodes:", extra_nodes, "job", job.name, "end time:", self.simulator.simulation_time + job.req_time)
         
         # Si hay suficientes cores para el job independientemente de los que vaya a usar el job bloqueado
-        if len(job.tasks) <= extra_nodes and len(job.tasks) <= node.count_idle_cores(): # (la segunda condicion es redundante¿?)
+        if job.ntasks <= extra_nodes and job.ntasks <= node.count_idle_cores(): # (la segunda condicion es redundante¿?)
             return True
         # Si hay suficientes cores para el job (utilizando parte de los del bloqueante) y el job termina antes del job bloqueante
-        elif len(job.tasks) <= node.count_idle_cores() and (self.simulator.simulation_time + job.req_time) <= shadow_time: 
+        elif job.ntasks <= node.count_idle_cores() and (self.simulator.simulation_time + job.req_time) <= shadow_time: 
             return True
         #print(f"\tno se puede backfill (shadow_time: {shadow_time}, extra_nodes: {extra_nodes})")
         return False
 
+    def lowest_energy(self, node, job: Job):
+        return self.node_energy(job, node)
+
+    def highest_energy(self, node, job: Job):
+        return -self.node_energy(job, node)
+
+    def lowest_edp(self, node, job: Job):
+        return self.node_edp(job, node)
+
+    def highest_edp(self, node, job: Job):
+        return -self.node_edp(job, node)
+
     def node_energy(self, job: Job, node):
         node_info = node.cores()[0]
 
@@ -3,7 +3,6 @@ from irmasim.Job import Job
 from irmasim.Task import Task
 from typing import TYPE_CHECKING
 from sortedcontainers import SortedList
-from irmasim.Options import Options
 import importlib
 import copy
 import sys
@@ -27,14 +26,14 @@ class Duplex(WorkloadManager):
         super(Duplex, self).__init__(simulator)
         if simulator.platform.config["model"] != "modelV1":
             raise Exception("Duplex workload manager needs a modelV1 platform")
-        if "scheduling_option" not in Options().get()["workload_manager"]:
+        if "scheduling_option" not in simulator.options["workload_manager"]:
             self.option = "duplex"
         else:
-            self.option = Options().get()["workload_manager"]["scheduling_option"] 
+            self.option = simulator.options["workload_manager"]["scheduling_option"] 
         if self.option != "duplex" and self.option != "min_min" and self.option != "max_min":
             raise Exception("Duplex workload manager needs a valid scheduling option")
         print("Using option: ", self.option)
-        mod = importlib.import_module("irmasim.platform.models." + Options().get()["platform_model_name"] + ".Node")
+        mod = importlib.import_module("irmasim.platform.models." + simulator.options["platform_model_name"] + ".Node")
         self.nodes = self.simulator.get_resources(getattr(mod, "Node"))
 
         self.lowest_mops = min([ node.children[0].mops_per_core for node in self.nodes ])
@@ -89,11 +88,10 @@ class Duplex(WorkloadManager):
                     node_idle_cores -= sch.job.ntasks_per_node
                     sch.running = True
                     for task in sch.job.tasks:
-                        for core in self.nodes[n].cores():
-                            if core.task == None:
-                                task.allocate(core.full_id())
-                                self.simulator.schedule([task])
-                                break # Go to next task
+                        core = self.nodes[n].first_idle_core()
+                        if core is not None:
+                            task.allocate(core.full_id(), core.handle)
+                            self.simulator.schedule([task])
 
 
     def on_end_step(self):
@@ -140,7 +138,7 @@ class Duplex(WorkloadManager):
                     for c in range(len(cores_temporal_times[n])):
                         cores_temporal_times[n][c] = sys.maxsize
                     continue
-                cores_task_times = sorted(cores_times[n])[:len(jobs[j].tasks)]
+                cores_task_times = sorted(cores_times[n])[:jobs[j].ntasks]
                 base_time = cores_task_times[-1]
                 if(self.simulator.simulation_time > base_time):
                     base_time = self.simulator.simulation_time
@@ -2,7 +2,6 @@ from irmasim.workload_manager.WorkloadManager import WorkloadManager as WM
 from irmasim.Job import Job
 from typing import TYPE_CHECKING
 from sortedcontainers import SortedList
-from irmasim.Options import Options
 import importlib
 
 if TYPE_CHECKING:
@@ -15,7 +14,7 @@ class EnergyHeuristic(WM):
         if simulator.platform.config["model"] != "modelV1":
             raise Exception("Heuristic workload manager needs a modelV1 platform")
 
-        options = Options().get()
+        options = simulator.options
 
         job_criteria = {
             'timetasks': {
@@ -34,16 +33,16 @@ class EnergyHeuristic(WM):
 
         resource_criteria = {
             'timetasks': {
-                'lowest': lambda node, job: self.node_energy(job, node),
-                'highest': lambda node, job: -self.node_energy(job, node),
+                'lowest': self.lowest_energy,
+                'highest': self.highest_energy,
             },
             'energy': {
-                'lowest': lambda node, job: self.node_energy(job, node),
-                'highest': lambda node, job: -self.node_energy(job, node),
+                'lowest': self.lowest_energy,
+                'highest': self.highest_energy,
             },
             'edp': {
-                'lowest': lambda node, job: self.node_edp(job, node),
-                'highest': lambda node, job: -self.node_edp(job, node)
+                'lowest': self.lowest_edp,
+                'highest': self.highest_edp
             }
         }
 
@@ -112,11 +111,10 @@ class EnergyHeuristic(WM):
         selected_node = self.select_node(j)
         if selected_node is not None:
             for task in j.tasks:
-                for core in selected_node.cores():
-                    if core.task is None:
-                        task.allocate(core.full_id())
-                        self.simulator.schedule([task])
-                        break
+                core = selected_node.first_idle_core()
+                if core is not None:
+                    task.allocate(core.full_id(), core.handle)
+                    self.simulator.schedule([task])
             assigned_list.append(j)
             self.assigned_nodes[selected_node.id] += 1
         return assigned_list
@@ -134,6 +132,18 @@ class EnergyHeuristic(WM):
 
         return selected_node
 
+    def lowest_energy(self, node, job: Job):
+        return self.node_energy(job, node)
+
+    def highest_energy(self, node, job: Job):
+        return -self.node_energy(job, node)
+
+    def lowest_edp(self, node, job: Job):
+        return self.node_edp(job, node)
+
+    def highest_edp(self, node, job: Job):
+        return -self.node_edp(job, node)
+
     def node_energy(self, job: Job, node):
         node_info = node.cores()[0]
 
@@ -13,7 +13,6 @@ import importlib
 if TYPE_CHECKING:
     from irmasim.workload_manager.Policy import Policy
 from irmasim.Simulator import Simulator
-from irmasim.Options import Options
 
 
 class Environment(gym.Env):
@@ -106,7 +105,7 @@ Attributes:
     def __init__(self, workload_manager: 'Policy', simulator: Simulator) -> None:
         self.workload_manager = workload_manager
         self.simulator = simulator
-        self.env_options = Options().get()["workload_manager"]["environment"]
+        self.env_options = self.simulator.options["workload_manager"]["environment"]
         self.last_job_queue_length = None
 
         self.job_selections = OrderedDict({
@@ -144,7 +143,7 @@ Attributes:
         self.action_space = gym.spaces.Discrete(nb_actions)
 
         #TODO: Send to "workload manager" ?
-        options = Options().get()
+        options = self.simulator.options
         mod = importlib.import_module("irmasim.platform.models." + options["platform_model_name"] + ".Node")
         klass = getattr(mod, 'Node')
         self.resources = self.simulator.get_resources(klass)
@@ -178,6 +177,59 @@ Attributes:
         self.reward = objective_to_reward[self.env_options['objective']]
         self.queue_sensitivity = self.env_options['queue_sensitivity']
         self.last_job_queue_length = 0
+        self.trajectory = 0
+
+    def reset(self, seed: int = None, options: dict = None) -> tuple:
+        """Starts a new trajectory of the simulator and runs it up to the first decision.
+
+From then on the agent decides through :meth:`step` instead of being called by the workload manager.
+
+Args:
+    seed (int):
+        Restarts the trajectories of the simulator with this seed.
+    options (dict):
+        Unused, required by the gym interface.
+
+Returns:
+    The observation at the first decision and an empty info dictionary.
+        """
+
+        super().reset(seed=seed)
+        if seed is not None:
+            self.simulator.set_seed(seed)
+            self.trajectory = 0
+        self.workload_manager.external = True
+        self.simulator.start_trajectory(self.trajectory)
+        self.trajectory += 1
+        self.simulator.step_trajectory()
+        self.advance()
+        self.workload_manager.last_time = self.simulator.simulation_time
+        return self.observation(), {}
+
+    def step(self, action: int) -> tuple:
+        """Applies the action and runs the simulator up to the next decision or the end of the trajectory.
+
+Args:
+    action (int):
+        Action ID to be applied.
+
+Returns:
+    The observation, the reward of the action, whether the trajectory has ended, whether it was
+    truncated (never) and an empty info dictionary.
+        """
+
+        self.workload_manager.apply_policy(action)
+        terminated = self.advance()
+        reward = self.reward()
+        self.workload_manager.last_time = self.simulator.simulation_time
+        return self.observation(), reward, terminated, False, {}
+
+    def advance(self) -> bool:
+        self.workload_manager.decision_pending = False
+        while self.simulator.next_event():
+            if self.workload_manager.decision_pending:
+                return False
+        return True
 
     @property
     def action_size(self):
@@ -270,7 +322,7 @@ Attributes:
         
 
     def observation_jaime(self):
-        options = Options().get()
+        options = self.simulator.options
         mod = importlib.import_module("irmasim.platform.models." + options["platform_model_name"] + ".Core")
         klass = getattr(mod, 'Core')
 
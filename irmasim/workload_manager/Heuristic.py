@@ -3,9 +3,7 @@ from irmasim.Job import Job
 from irmasim.Task import Task
 from typing import TYPE_CHECKING
 from sortedcontainers import SortedList
-from irmasim.Options import Options
 import importlib
-import random as rand
 
 if TYPE_CHECKING:
     from irmasim.Simulator import Simulator
@@ -15,7 +13,7 @@ class Heuristic(WorkloadManager):
         super(Heuristic, self).__init__(simulator)
         if simulator.platform.config["model"] != "modelV1":
             raise Exception("Heuristic workload manager needs a modelV1 platform")
-        options = Options().get()
+        options = simulator.options
 
         if not "job_selection" in options["workload_manager"]:
             self.job_scheduler = 'first'
@@ -61,7 +59,7 @@ class Heuristic(WorkloadManager):
 
     def on_job_submission(self, jobs: list):
         for job in jobs:
-           job.rand=rand.random()
+           job.rand=self.simulator.random.random()
         self.pending_jobs.update(jobs)
         while self.schedule_next_job():
             pass
@@ -81,11 +79,10 @@ class Heuristic(WorkloadManager):
             return False
 
         for task,node in zip(next_job.tasks,selected_nodes):
-            for core in node.cores():
-                if core.task == None:
-                    task.allocate(core.full_id())
-                    self.simulator.schedule([task])
-                    break
+            core = node.first_idle_core()
+            if core is not None:
+                task.allocate(core.full_id(), core.handle)
+                self.simulator.schedule([task])
 
         self.pending_jobs.remove(next_job)
         self.running_jobs.add(next_job)
@@ -95,7 +92,7 @@ class Heuristic(WorkloadManager):
         viable_nodes = [ node for node in self.resources if node.count_idle_cores() >= job.ntasks_per_node ]
 
         if self.node_scheduler == 'random':
-            rand.shuffle(viable_nodes)
+            self.simulator.random.shuffle(viable_nodes)
         else:
             viable_nodes.sort(key=self.node_sort_key)
         selected_nodes = []
@@ -30,7 +30,7 @@ class Minimal(WorkloadManager):
             pass
 
     def schedule_next_job(self):
-        if self.pending_jobs != [] and self.idle_resources >= len(self.pending_jobs[0].tasks):
+        if self.pending_jobs != [] and self.idle_resources >= self.pending_jobs[0].ntasks:
             next_job = self.pending_jobs.pop(0)
             for task in next_job.tasks:
                 self.allocate(task)
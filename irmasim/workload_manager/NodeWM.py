@@ -2,7 +2,6 @@ import importlib
 from irmasim.workload_manager.WorkloadManager import WorkloadManager
 from irmasim.Job import Job
 from irmasim.Task import Task
-from irmasim.Options import Options
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -13,7 +12,7 @@ class NodeWM(WorkloadManager):
         super(NodeWM, self).__init__(simulator)
         if simulator.platform.config["model"] != "modelV2":
             raise Exception("NodeWM workload manager needs a modelV2 platform")
-        options = Options().get()
+        options = simulator.options
         mod = importlib.import_module("irmasim.platform.models." + options["platform_model_name"] + ".Node")
         klass = getattr(mod, 'Node')
         resources = self.simulator.get_resources(klass)
@@ -6,7 +6,6 @@ import torch
 import logging
 import os.path as path
 from irmasim.workload_manager.WorkloadManager import WorkloadManager
-from irmasim.Options import Options
 from irmasim.workload_manager.Environment import Environment
 from typing import TYPE_CHECKING
 
@@ -19,7 +18,7 @@ class Policy(WorkloadManager):
         super(Policy, self).__init__(simulator)
         if simulator.platform.config["model"] != "modelV1":
             raise Exception("Policy workload manager needs a modelV1 platform")
-        options = Options().get()
+        options = simulator.options
         mod = importlib.import_module("irmasim.platform.models." + options["platform_model_name"] + ".Core")
         klass = getattr(mod, 'Core')
         self.resources = self.simulator.get_resources(klass)
@@ -35,6 +34,12 @@ class Policy(WorkloadManager):
 
         self.environment = Environment(self, simulator)
         self.agent, self.optimizer = self.create_agent()
+        # Decisions of a rollout, which is learned by another process or replayed when resuming a checkpoint
+        self.observations = []
+        self.actions = []
+        # With an external agent the decisions are taken through the step method of the environment
+        self.external = False
+        self.decision_pending = False
         self.flow_flags = {
             'action_taken': False,
             'void_taken': False
@@ -65,12 +70,12 @@ class Policy(WorkloadManager):
     """
 
     def create_agent(self):
-        agent_options = Options().get()["workload_manager"]["agent"]
+        agent_options = self.simulator.options["workload_manager"]["agent"]
         module = "irmasim.workload_manager.agent." + agent_options["name"]
         print(f"Using agent {module}.")
         mod = importlib.import_module(module)
         klass = getattr(mod, agent_options["name"])
-        agent = klass(self.environment.action_size, self.environment.observation_size)
+        agent = klass(self.environment.action_size, self.environment.observation_size, self.simulator.options)
         optimizer: torch.optim = torch.optim.Adam(agent.parameters(), lr=float(agent_options['lr']))
 
         if 'input_model' in agent_options and path.isfile(agent_options['input_model']) and self.load_agent:
@@ -80,7 +85,8 @@ class Policy(WorkloadManager):
             checkpoint['optimizer_state_dict']['param_groups'][0]['lr'] = float(agent_options['lr'])
             optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
 
-        if agent_options['phase'] == 'train':
+        agent.set_seed(self.simulator.derive_seed(self.simulator.AGENT_STREAM))
+        if agent_options['phase'] in ['train', 'rollout']:
             agent.train()
         else:
             agent.eval()
@@ -94,10 +100,16 @@ class Policy(WorkloadManager):
             self.running_jobs.remove(job)
 
     def on_end_step(self):
+        if self.external:
+            self.decision_pending = True
+            return
         self.agent.rewarded(self.environment)
         self.last_time = self.simulator.simulation_time
         observation = self.agent.observe(self.environment)
         action = self.agent.decide(observation)
+        if self.simulator.options['workload_manager']['agent']['phase'] in ['train', 'rollout']:
+            self.observations.append(observation)
+            self.actions.append(action)
         self.apply_policy(action)
 
     def apply_policy(self, action: int):
@@ -108,33 +120,64 @@ class Policy(WorkloadManager):
         available_resources = [resource for resource in self.resources if resource.task is None]
         if key[1] != None:
             available_resources.sort(key=key[1])
-        while self.pending_jobs and len(self.pending_jobs[0].tasks) <= len(available_resources):
+        while self.pending_jobs and self.pending_jobs[0].ntasks <= len(available_resources):
             next_job = self.pending_jobs.pop(0)
             for task in next_job.tasks:
-                task.allocate(available_resources.pop(0).full_id())
+                resource = available_resources.pop(0)
+                task.allocate(resource.full_id(), resource.handle)
             self.simulator.schedule(next_job.tasks)
             self.running_jobs.append(next_job)
 
     def on_end_simulation(self):
-        options = Options().get()
-        if options['workload_manager']['agent']['phase'] == 'train':
+        options = self.simulator.options
+        if options['workload_manager']['agent']['phase'] in ['train', 'rollout']:
             probs = self.agent.get_probs()
-            header = not os.path.isfile('{0}/probs.log'.format(Options().get()['output_dir']))
-            with open('{0}/probs.log'.format(Options().get()['output_dir']), 'a+') as out_f:
+            header = not os.path.isfile('{0}/probs.log'.format(options['output_dir']))
+            with open('{0}/probs.log'.format(options['output_dir']), 'a+') as out_f:
                 if header:
                    out_f.write(" ".join([self.environment.actions[action][2]+"-"+self.environment.actions[action][3] for action in range(len(probs))])+"\n")
                 out_f.write(" ".join([str(p) for p in probs])+"\n")
-            loss = self.agent.loss()
-            with open('{0}/losses.log'.format(options['output_dir']), 'a+') as out_f:
-                out_f.write(f'{loss}\n')
-            self.optimizer.zero_grad()
-            loss.backward()
-            self.optimizer.step()
-            if 'output_model' in options['workload_manager']['agent']:
-                print(f"Writing model to {options['workload_manager']['agent']['output_model']}")
-                torch.save({
-                    'model_state_dict': self.agent.state_dict(),
-                    'optimizer_state_dict': self.optimizer.state_dict()
-                }, options['workload_manager']['agent']['output_model'])
+        if options['workload_manager']['agent']['phase'] == 'train':
+            self.update(self.agent.loss())
         with open('{0}/rewards.log'.format(options['output_dir']), 'a+') as out_f:
             out_f.write(f'{np.sum(self.agent.rewards)}\n')
+
+    def shared_objects(self) -> list:
+        # Tensors computed by the agent are part of the graph of the loss and cannot be copied
+        return getattr(self.agent, 'log_probs', []) + getattr(self.agent, 'values', [])
+
+    def on_fork(self):
+        # The graph of the loss belongs to the original simulator, which is the one that learns
+        self.simulator.options['workload_manager']['agent']['phase'] = 'eval'
+        self.agent.eval()
+
+    def on_resume(self):
+        # The graph of the loss is not saved in checkpoints, it is built again from the decisions
+        if self.simulator.options['workload_manager']['agent']['phase'] == 'train':
+            self.agent.replay(self.observations, self.actions, self.agent.rewards)
+
+    def rollout(self):
+        return self.observations, self.actions, self.agent.rewards
+
+    def learn(self, rollouts: list):
+        """ Updates the agent with rollouts simulated in other processes with its current weights. The loss is the
+        mean of the losses of the rollouts. """
+        losses = []
+        for observations, actions, rewards in rollouts:
+            self.agent.replay(observations, actions, rewards)
+            losses.append(self.agent.loss())
+        self.update(torch.stack(losses).mean())
+
+    def update(self, loss: torch.Tensor):
+        options = self.simulator.options
+        with open('{0}/losses.log'.format(options['output_dir']), 'a+') as out_f:
+            out_f.write(f'{loss}\n')
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+        if 'output_model' in options['workload_manager']['agent']:
+            print(f"Writing model to {options['workload_manager']['agent']['output_model']}")
+            torch.save({
+                'model_state_dict': self.agent.state_dict(),
+                'optimizer_state_dict': self.optimizer.state_dict()
+            }, options['workload_manager']['agent']['output_model'])
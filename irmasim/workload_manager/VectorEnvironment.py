@@ -0,0 +1,37 @@
+import gym.vector
+from functools import partial
+from irmasim.Simulator import Simulator
+from irmasim.workload_manager.Environment import Environment
+
+
+class VectorEnvironment:
+    """ Environments of several simulators stepped together, with their observations, rewards and terminations
+    batched. The simulators run in this process or, if asynchronous, each one in a subprocess. A trajectory that
+    ends is followed by a new one of the same simulator. """
+
+    def __init__(self, options: list, asynchronous: bool = False):
+        factories = [ partial(VectorEnvironment.make_environment, run_options, run)
+                      for run, run_options in enumerate(options) ]
+        if asynchronous:
+            self.environments = gym.vector.AsyncVectorEnv(factories)
+        else:
+            self.environments = gym.vector.SyncVectorEnv(factories)
+        self.num_envs = self.environments.num_envs
+        self.action_space = self.environments.action_space
+        self.observation_space = self.environments.observation_space
+
+    @staticmethod
+    def make_environment(options: dict, run: int) -> Environment:
+        simulator = Simulator(options=options, run=run)
+        if simulator.options['workload_manager']['type'] != 'Policy':
+            raise Exception("VectorEnvironment needs a Policy workload manager")
+        return simulator.workload_manager.environment
+
+    def reset(self, seed: int = None):
+        return self.environments.reset(seed=seed)
+
+    def step(self, actions):
+        return self.environments.step(actions)
+
+    def close(self):
+        self.environments.close()
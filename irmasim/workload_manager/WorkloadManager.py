@@ -23,3 +23,13 @@ class WorkloadManager:
     def on_end_simulation(self):
         pass
 
+    def shared_objects(self) -> list:
+        """ Objects that a fork of the simulator uses without copying them. """
+        return []
+
+    def on_fork(self):
+        pass
+
+    def on_resume(self):
+        pass
+
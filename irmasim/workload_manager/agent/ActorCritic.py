@@ -6,6 +6,7 @@ import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torch.distributions import Categorical
 from irmasim.workload_manager.agent.Agent import PolicyLearningAgent, ValueLearningAgent
 from irmasim.Options import Options
 
@@ -47,10 +48,12 @@ Attributes:
         The inner model implementation with the Actor and Critic.
     """
 
-    def __init__(self, action_size: int, observation_size: int) -> None:
-        gamma = Options().get()["workload_manager"]["agent"]["gamma"]
-        hidden = Options().get()["workload_manager"]["agent"]["hidden"]
-        super(ActorCritic, self).__init__(Options().get()["workload_manager"])
+    def __init__(self, action_size: int, observation_size: int, options: dict = None) -> None:
+        if options is None:
+            options = Options().get()
+        gamma = options["workload_manager"]["agent"]["gamma"]
+        hidden = options["workload_manager"]["agent"]["hidden"]
+        super(ActorCritic, self).__init__(options["workload_manager"])
         self.input = nn.Linear(observation_size, hidden, device=DEVICE)
         self.actor_hidden_0 = nn.Linear(hidden, hidden, device=DEVICE)
         self.actor_hidden_1 = nn.Linear(hidden, hidden, device=DEVICE)
@@ -69,6 +72,43 @@ Attributes:
             self.probs = probs.cpu().detach().numpy().flatten().tolist()
         return self.get_action(probs)
 
+    def decide_batch(self, observations: np.ndarray) -> np.ndarray:
+        """Chooses an action for every observation of a batch with a single forward pass.
+
+Nothing is stored for learning, it is meant for acting on a vector of environments.
+
+Args:
+    observations (:class:`~numpy.ndarray`):
+        Batch of observations, one per row.
+
+Returns:
+    Array with the action ID for each observation.
+        """
+
+        with torch.no_grad():
+            probs = self.forward_policy(torch.from_numpy(observations).to(DEVICE))
+        return self.sample(Categorical(probs)).cpu().numpy()
+
+    def replay(self, observations: list, actions: list, rewards: list) -> None:
+        """Rebuilds the decisions of a simulation run elsewhere, so that its loss can be computed here.
+
+Args:
+    observations (list):
+        Observations in the order they were decided on.
+    actions (list):
+        Action IDs chosen for each observation.
+    rewards (list):
+        Rewards obtained during the simulation.
+        """
+
+        self.rewards = list(rewards)
+        self.values = []
+        self.log_probs = []
+        for observation, action in zip(observations, actions):
+            probs, value = self.forward(torch.from_numpy(observation).to(DEVICE))
+            self.save_value(value.cpu())
+            self.save_log_prob(Categorical(probs).log_prob(torch.tensor(action, device=DEVICE)))
+
     def forward(self, observation_tensor: torch.Tensor) -> tuple:
         probs = self.forward_policy(observation_tensor)
         value = self.forward_value(observation_tensor)
@@ -87,7 +127,7 @@ Attributes:
         out_1 = F.leaky_relu(self.actor_hidden_0(out_0))
         out_2 = F.leaky_relu(self.actor_hidden_1(out_1))
         out_3 = F.leaky_relu(self.actor_hidden_2(out_2))
-        return F.softmax(self.actor_output(out_3), dim=0)
+        return F.softmax(self.actor_output(out_3), dim=-1)
 
 
 
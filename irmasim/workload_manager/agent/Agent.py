@@ -190,6 +190,8 @@ Attributes:
         super().__init__(options)
         self.probs = None
         self.log_probs = []
+        self.seed = None
+        self.generator = None
 
     def decide(self, observation: np.ndarray) -> int:
         """Process the observation and return the action ID.
@@ -253,6 +255,17 @@ Returns:
 
         raise NotImplementedError
 
+    def set_seed(self, seed: int) -> None:
+        """Samples the actions from a generator of the agent, seeded with the given seed, instead of the global one.
+
+Args:
+    seed (int):
+        Seed of the generator.
+        """
+
+        self.seed = seed
+        self.generator = None
+
     def get_probs(self) -> list:
         return self.probs
 
@@ -272,10 +285,28 @@ Returns:
 
         logging.info('Probs %s', probabilities)
         dist = Categorical(probabilities)
-        action = dist.sample()
+        action = self.sample(dist)
         self.save_log_prob(dist.log_prob(action))
         return action.item()
 
+    def sample(self, dist: Categorical) -> torch.Tensor:
+        """Samples one action per distribution, from the generator of the agent if it has a seed.
+
+Args:
+    dist (:class:`~torch.distributions.Categorical`):
+        Distribution, or batch of distributions, over actions.
+
+Returns:
+    Tensor with the sampled action IDs, with the batch shape of the distribution.
+        """
+
+        if self.seed is None:
+            return dist.sample()
+        if self.generator is None:
+            self.generator = torch.Generator(device=dist.probs.device).manual_seed(self.seed)
+        return torch.multinomial(dist.probs.reshape(-1, dist.probs.size(-1)), 1, True,
+                                 generator=self.generator).reshape(dist.batch_shape)
+
     def policy_loss(self, rews_or_advs: list) -> list:
         """Calculates the losses based on the policy learned.
 
@@ -0,0 +1,101 @@
+import copy
+import json
+import os
+import random
+import subprocess
+import sys
+import numpy
+import pytest
+import irmasim
+from irmasim.Options import Options
+from irmasim.Result import Result
+from irmasim.Simulator import Simulator
+from irmasim.cmd import LOG_FILES, complete_options
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(irmasim.__file__)))
+# The logs every simulation writes
+LOGS = LOG_FILES
+
+
+def write_trace(directory: str, jobs: int, seed: int, memory_volumes: list) -> dict:
+    """ A modelV1 platform of 16 nodes with two 8-core processors and a workload with arrivals every tenth of a
+    second, so that completions often fall close to arrivals. Returns the options to simulate them. """
+    generator = random.Random(seed)
+    processor = {"id": "p", "cores": 8, "clock_rate": 2.0, "dpflops_per_cycle": 4,
+                 "static_power": 6.0, "dynamic_power": 5, "min_power": 0.05,
+                 "b": -1.85e-05, "c": 32000, "da": 1.75, "db": 2000, "dc": 50000, "dd": 6000}
+    platform = {"platform": {"p256": {"id": "p256", "model_name": "modelV1", "clusters": [{"id": "c0", "nodes": [
+                    {"type": "n16", "number": 16}]}]}},
+                "node": {"n16": {"id": "n", "processors": [{"type": "pa", "number": 2}]}},
+                "processor": {"pa": processor}}
+    with open(os.path.join(directory, "platform.json"), "w") as out_f:
+        json.dump(platform, out_f, indent=1)
+    workload, time = [], 0
+    for i in range(jobs):
+        time = round(time + generator.choice([0, 0.1, 0.3, 0.5, 0.7, 1.1, 1.9]), 1)
+        res = generator.choice([1, 1, 2, 4, 4, 8, 16])
+        seconds = generator.randint(50, 1000) / 10
+        workload.append({"id": str(i), "subtime": time, "res": res, "req_time": seconds * 2,
+                         "req_ops": int(round(seconds * 8e9)), "ipc": 1, "mem": generator.randint(100, 3000),
+                         "mem_vol": generator.choice(memory_volumes)})
+    with open(os.path.join(directory, "jobs.json"), "w") as out_f:
+        json.dump({"jobs": workload}, out_f)
+    return {"seed": 3, "platform_file": os.path.join(directory, "platform.json"), "platform_name": "p256",
+            "workload_file": os.path.join(directory, "jobs.json"), "trajectory_origin": "0",
+            "trajectory_length": "0", "output_dir": os.path.join(directory, "output"),
+            "workload_manager": {"type": "Minimal"}}
+
+
+@pytest.fixture
+def trace(tmp_path):
+    """ Writes the trace of write_trace and returns its options, with the given workload manager. """
+    def make(manager: str = "Minimal", jobs: int = 3000, seed: int = 5, memory_volumes: list = (0, 0, 0, 0, 10)):
+        options = write_trace(str(tmp_path), jobs, seed, list(memory_volumes))
+        options["workload_manager"]["type"] = manager
+        return options
+    return make
+
+
+@pytest.fixture
+def launch(tmp_path):
+    """ Runs the irmasim command on an options dictionary, in a new process. Code given as prelude runs before. """
+    def run(options: dict, *args: str, prelude: str = ""):
+        options_file = os.path.join(str(tmp_path), "options.json")
+        with open(options_file, "w") as out_f:
+            json.dump(options, out_f)
+        environment = dict(os.environ, PYTHONPATH=REPOSITORY)
+        program = prelude + "\nfrom irmasim.cmd import launch\nlaunch()\n"
+        return subprocess.run([sys.executable, "-c", program, options_file] + list(args), cwd=str(tmp_path),
+                              env=environment, capture_output=True, text=True)
+    return run
+
+
+def read_log(directory: str, name: str) -> list:
+    with open(os.path.join(directory, name)) as in_f:
+        return in_f.readlines()
+
+
+def assert_same_logs(directory: str, expected: str):
+    for log in LOGS:
+        assert read_log(directory, log) == read_log(expected, log), log
+
+
+def simulator(config: dict, **options) -> Simulator:
+    """ A simulator of the configuration, with the options irmasim.run would give it. """
+    complete = Options.defaults()
+    complete.update(copy.deepcopy(config))
+    complete.update(options)
+    complete_options(complete)
+    return Simulator(options=complete)
+
+
+def finish(simulator: Simulator) -> Result:
+    """ Runs the simulator to its end, step by step. """
+    while simulator.next_event():
+        pass
+    return Result(simulator)
+
+
+def assert_same_results(result: Result, expected: Result):
+    assert result.statistics == expected.statistics
+    assert numpy.array_equal(result.jobs, expected.jobs)
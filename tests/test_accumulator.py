@@ -0,0 +1,44 @@
+import math
+import random
+import pytest
+from irmasim.Accumulator import Accumulator, Quantile
+
+
+def stream(size: int) -> list:
+    # Correlated and with a trend, like the slowdowns of a queue that fills up
+    generator = random.Random(1)
+    values, value = [], 1.0
+    for i in range(size):
+        value = max(1.0, value * generator.uniform(0.9, 1.12) + i / size)
+        values.append(value)
+    return values
+
+
+@pytest.mark.parametrize("quantile", [0, 0.25, 0.5, 0.9, 0.99, 1])
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantile(quantile, accuracy):
+    values = stream(5000) + [0.0] * 50 + [-3.5, -0.2]
+    estimate = Quantile(quantile, accuracy)
+    for value in values:
+        estimate.add(value)
+    exact = sorted(values)[math.floor(quantile * (len(values) - 1))]
+    assert abs(estimate.value() - exact) <= accuracy * abs(exact)
+
+
+def test_merge():
+    values = stream(3000)
+    whole, first, second = Quantile(0.9), Quantile(0.9), Quantile(0.9)
+    for i, value in enumerate(values):
+        whole.add(value)
+        (first if i % 2 else second).add(value)
+    first.merge(second)
+    assert first.value() == whole.value()
+
+
+def test_statistics():
+    accumulator = Accumulator([0.5, 0.99])
+    assert math.isnan(accumulator.statistics()["p50"])
+    for value in [1, 2, 3, 4]:
+        accumulator.add(value)
+    assert accumulator.statistics() == {"total": 10.0, "avg": 2.5, "max": 4, "min": 1,
+                                        "p50": pytest.approx(2, rel=0.01), "p99": pytest.approx(3, rel=0.01)}
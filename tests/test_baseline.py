@@ -0,0 +1,34 @@
+import csv
+import hashlib
+import io
+import pytest
+import irmasim
+
+# Results of the simulator before tasks were advanced by rate groups, jobs were completed at the end of the step
+# and merged calendars were introduced, on the trace of conftest.write_trace
+BASELINE = {
+    "Minimal": (3192.699999999987, 4517745.400000007, 18.718776497657945, 1730632.9999999995,
+                "47da99eadc1e2dbe5aef68fe346cc45035cb37ba26f57e24ce149d4ba875eff2"),
+    "Heuristic": (3553.8999999999987, 4560492.370000002, 23.966265199440734, 2243372.9999999995,
+                  "97d34938a353bfa1bc9109bc433401c748b48210291726d116c6f4893bc6a9bb"),
+}
+
+
+def digest(jobs_log: str) -> str:
+    # The execution time of a task is added per rate change, so it may differ from the baseline in the last digits
+    rows = []
+    for row in csv.reader(io.StringIO(jobs_log)):
+        del row[8]
+        rows.append(",".join(row) + "\n")
+    return hashlib.sha256("".join(rows).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("manager", sorted(BASELINE))
+def test_baseline(trace, manager):
+    makespan, energy, slowdown, waiting_time, jobs_log = BASELINE[manager]
+    result = irmasim.run(trace(manager), logs=True)
+    assert result.statistics["simulation_time"]["total"] == makespan
+    assert result.statistics["energy"]["total"] == energy
+    assert result.statistics["slowdown"]["avg"] == slowdown
+    assert result.statistics["waiting_time"]["total"] == waiting_time
+    assert digest(result.logs["jobs.log"]) == jobs_log
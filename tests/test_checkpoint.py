@@ -0,0 +1,51 @@
+import json
+import os
+import pytest
+from irmasim.Checkpoint import Checkpoint
+from conftest import assert_same_logs, assert_same_results, finish, simulator
+
+# Ends the process without any cleanup right after the given number of checkpoints have been written
+KILL = """
+import os
+from irmasim.Checkpoint import Checkpoint
+save = Checkpoint.save
+saved = [0]
+def killing_save(self, *args):
+    save(self, *args)
+    saved[0] += 1
+    if saved[0] == {kill}:
+        os._exit(3)
+Checkpoint.save = killing_save
+"""
+
+
+@pytest.mark.parametrize("kill", [1, 3, 5])
+def test_resume(trace, launch, tmp_path, kill):
+    options = trace("Heuristic", jobs=500)
+    options["workload_manager"]["job_selection"] = "random"
+    expected = os.path.join(str(tmp_path), "expected")
+    resumed = os.path.join(str(tmp_path), "resumed")
+    arguments = ["-nr", "2", "-ce", "300"]
+    assert launch(options, *arguments, "-o", expected).returncode == 0
+    assert launch(options, *arguments, "-o", resumed, prelude=KILL.format(kill=kill)).returncode == 3
+    assert launch(options, *arguments, "-o", resumed, "--resume").returncode == 0
+    assert_same_logs(resumed, expected)
+
+
+@pytest.mark.parametrize("time", [0, 100, 400])
+def test_future_jobs(trace, tmp_path, time):
+    options = trace("Heuristic", jobs=500)
+    # Reverses blocks of jobs, so that the jobs waiting to arrive are not consecutive in the workload
+    with open(options["workload_file"]) as in_f:
+        jobs = json.load(in_f)["jobs"]
+    jobs = [job for block in range(0, len(jobs), 20) for job in reversed(jobs[block:block + 20])]
+    with open(options["workload_file"], "w") as out_f:
+        json.dump({"jobs": jobs}, out_f)
+    original = simulator(options, job_record=True)
+    original.run_until(time)
+    checkpoint = Checkpoint(dict(original.options, output_dir=str(tmp_path)), [])
+    checkpoint.save(0, original)
+    run, restored = checkpoint.restore(original.options)
+    assert [job.id for job in restored.job_queue.future_jobs] == [job.id for job in original.job_queue.future_jobs]
+    assert restored.job_queue.get_job_counts() == original.job_queue.get_job_counts()
+    assert_same_results(finish(restored), finish(original))
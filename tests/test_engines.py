@@ -0,0 +1,14 @@
+import pytest
+import irmasim
+
+
+def simulate(options: dict, engine: str):
+    result = irmasim.run(dict(options, platform_engine=engine), logs=True)
+    return result.statistics, result.logs
+
+
+@pytest.mark.parametrize("manager", ["Minimal", "Heuristic"])
+def test_arrays_as_objects(trace, manager):
+    # Memory volumes high enough for most processors to run under contention
+    options = trace(manager, jobs=1000, memory_volumes=(0, 20000, 50000, 200000))
+    assert simulate(options, "arrays") == simulate(options, "objects")
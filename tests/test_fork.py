@@ -0,0 +1,19 @@
+import pytest
+from irmasim.Result import Result
+from conftest import assert_same_results, finish, simulator
+
+
+@pytest.mark.parametrize("time", [0, 150.5, 600])
+def test_fork(trace, time):
+    options = trace("Heuristic", jobs=500)
+    # Random job selection, so that the copy must also go on with the same generators
+    options["workload_manager"]["job_selection"] = "random"
+    expected = simulator(options, job_record=True)
+    expected.start_simulation()
+    expected = Result(expected)
+    original = simulator(options, job_record=True)
+    original.run_until(time)
+    forked = original.fork()
+    assert forked.simulation_time == original.simulation_time
+    assert_same_results(finish(forked), expected)
+    assert_same_results(finish(original), expected)
@@ -0,0 +1,30 @@
+import contextlib
+import io
+import os
+import pytest
+import irmasim
+from irmasim.cmd import print_statistics
+from conftest import LOGS, read_log
+
+STATISTICS = [("Simulation time:", "simulation_time"), ("Energy consumption:", "energy"),
+              ("User energy estimation:", "energy_user_estimation"), ("Energy efficiency:", "energy_efficiency"),
+              ("Utilisation:", "utilisation"), ("Exploitation:", "exploitation"), ("Jobs:", "jobs"),
+              ("Slowdown: ", "slowdown"), ("Bounded Slowdown: ", "bounded_slowdown"),
+              ("Waiting Time: ", "waiting_time"), ("Relative Execution Time: ", "relative_execution_time")]
+
+
+@pytest.mark.parametrize("manager", ["Minimal", "Heuristic"])
+def test_run_as_command(trace, launch, tmp_path, manager):
+    options = trace(manager, jobs=500)
+    options["workload_manager"]["job_selection"] = "random"
+    output = os.path.join(str(tmp_path), "command")
+    command = launch(options, "-o", output)
+    assert command.returncode == 0
+    result = irmasim.run(options, logs=True)
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        for message, statistic in STATISTICS:
+            print_statistics(message, result.statistics[statistic])
+    assert printed.getvalue() in command.stdout
+    for log in LOGS:
+        assert result.logs[log].splitlines(keepends=True) == read_log(output, log)
@@ -0,0 +1,14 @@
+import os
+from conftest import assert_same_logs, read_log
+
+
+def test_pool_as_serial(trace, launch, tmp_path):
+    options = trace("Heuristic", jobs=300)
+    # Random job selection, so that every run draws from its own generator
+    options["workload_manager"]["job_selection"] = "random"
+    serial = os.path.join(str(tmp_path), "serial")
+    pool = os.path.join(str(tmp_path), "pool")
+    assert launch(options, "-nr", "3", "-o", serial).returncode == 0
+    assert launch(options, "-nr", "3", "-j", "2", "-o", pool).returncode == 0
+    assert_same_logs(pool, serial)
+    assert read_log(serial, "jobs.log") != []
@@ -0,0 +1,30 @@
+import numpy
+import pytest
+from conftest import simulator
+
+
+def simulate(options: dict, **retirement):
+    finished = simulator(options, **retirement)
+    finished.start_simulation()
+    return finished
+
+
+@pytest.mark.parametrize("window", [0, 10])
+def test_finished_window(trace, window):
+    options = trace("Heuristic", jobs=1500)
+    expected = simulate(options)
+    windowed = simulate(options, finished_window=window)
+    assert windowed.get_statistics() == expected.get_statistics()
+    assert windowed.job_queue.get_job_counts() == expected.job_queue.get_job_counts()
+    assert len(expected.job_queue.finished_jobs) == 1500
+    assert [job.id for job in windowed.job_queue.finished_jobs] == \
+           [job.id for job in expected.job_queue.finished_jobs[len(expected.job_queue.finished_jobs) - window:]]
+
+
+def test_job_record(trace):
+    options = trace("Heuristic", jobs=1500)
+    expected = simulate(options).job_queue.finished_jobs
+    record = simulate(options, finished_window=0, job_record=True).job_queue.finished_record.array()
+    assert record.size == 1500
+    for field in ["id", "submit_time", "start_time", "finish_time", "nodes", "ntasks", "req_time", "ops"]:
+        assert numpy.array_equal(record[field], [getattr(job, field) for job in expected])
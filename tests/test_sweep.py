@@ -0,0 +1,26 @@
+from irmasim.cmd import sweep_configurations, sweep_jobs
+
+
+def test_grid_over_nested_options():
+    spec = {"grid": {"workload_manager.job_selection": ["first", "shortest", "smallest"]},
+            "list": [{"name": "h", "workload_manager": {"type": "Heuristic"}},
+                     {"name": "m", "seed": 1}]}
+    configurations = sweep_configurations(spec)
+    jobs = sweep_jobs({"seed": 0}, configurations, "sweep")
+    assert [name for name, options in jobs] == ["h-0", "h-1", "h-2", "m-3", "m-4", "m-5"]
+    for (name, options), selection in zip(jobs, ["first", "shortest", "smallest"] * 2):
+        assert options["workload_manager"]["job_selection"] == selection
+        assert options["output_dir"] == "sweep/" + name
+    assert [options["workload_manager"]["type"] for name, options in jobs] == ["Heuristic"] * 3 + ["Minimal"] * 3
+    assert [options["seed"] for name, options in jobs] == [0] * 3 + [1] * 3
+    # The overrides written to sweep.csv are those of the sweep file only
+    assert configurations[0][1] == {"workload_manager": {"type": "Heuristic"},
+                                    "workload_manager.job_selection": "first"}
+    assert spec["list"][0] == {"name": "h", "workload_manager": {"type": "Heuristic"}}
+
+
+def test_list_of_nested_options():
+    spec = {"list": [{"workload_manager": {"type": "Heuristic", "job_selection": "first"}},
+                     {"workload_manager.job_selection": "shortest"}]}
+    jobs = sweep_jobs({"workload_manager": {"type": "Heuristic"}}, sweep_configurations(spec), "sweep")
+    assert [options["workload_manager"]["job_selection"] for name, options in jobs] == ["first", "shortest"]
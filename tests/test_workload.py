@@ -0,0 +1,95 @@
+import copy
+import json
+import os
+import pytest
+import irmasim
+from irmasim.WorkloadReader import WorkloadReader
+from conftest import simulator
+
+
+def test_set_workload(trace, tmp_path):
+    options = trace(jobs=100)
+    with open(options["workload_file"]) as in_f:
+        jobs = json.load(in_f)["jobs"]
+    other = os.path.join(str(tmp_path), "other.json")
+    with open(other, "w") as out_f:
+        json.dump({"jobs": jobs[:40]}, out_f)
+    expected = irmasim.run(dict(options, workload_file=other)).statistics
+    changed = simulator(options)
+    given = copy.deepcopy(changed.options)
+    changed.set_workload(other)
+    changed.start_simulation()
+    assert changed.get_statistics() == expected
+    assert changed.options == given
+
+
+def write_workload(options: dict, directory: str, jobs: int) -> dict:
+    """ The first jobs of the trace as JSON, with CRLF line ends and the profiles after the jobs, and as CSV. """
+    with open(options["workload_file"]) as in_f:
+        records = json.load(in_f)["jobs"][:jobs]
+    files = {"json": os.path.join(directory, "crlf.json"), "csv": os.path.join(directory, "jobs.csv")}
+    with open(files["json"], "w", newline="\r\n") as out_f:
+        json.dump({"jobs": records, "profiles": {}}, out_f, indent=1)
+    with open(files["csv"], "w") as out_f:
+        out_f.write(",".join(records[0]) + "\n")
+        for record in records:
+            out_f.write(",".join([str(value) for value in record.values()]) + "\n")
+    return files
+
+
+@pytest.mark.parametrize("kind", ["json", "csv"])
+def test_offsets(trace, tmp_path, monkeypatch, kind):
+    workload_file = write_workload(trace(), str(tmp_path), 100)[kind]
+    expected = list(WorkloadReader(workload_file).jobs())
+    assert len(expected) == 100
+    monkeypatch.setattr(WorkloadReader, "OFFSET_STEP", 7)
+    reader = WorkloadReader(workload_file)
+    assert len(reader.offsets) == 15
+    for origin in [0, 1, 6, 7, 8, 50, 98, 99]:
+        assert list(reader.jobs(origin)) == expected[origin:]
+
+
+def test_window(trace):
+    options = trace("Heuristic", jobs=1000)
+    expected = irmasim.run(options, logs=True)
+    windowed = simulator(options, workload_window=10, job_record=True)
+    future = 0
+    while windowed.next_event():
+        future = max(future, len(windowed.job_queue.future_jobs))
+    assert future < 50
+    result = irmasim.run(dict(options, workload_window=10), logs=True)
+    assert result.statistics == expected.statistics
+    assert result.logs == expected.logs
+
+
+def test_window_unsorted(trace):
+    options = trace(jobs=200)
+    with open(options["workload_file"]) as in_f:
+        jobs = json.load(in_f)["jobs"]
+    jobs[150]["subtime"] = 0.5
+    with open(options["workload_file"], "w") as out_f:
+        json.dump({"jobs": jobs}, out_f)
+    assert irmasim.run(options).statistics["jobs"]["finished"] == 200
+    with pytest.raises(Exception, match="workload_window"):
+        irmasim.run(dict(options, workload_window=10))
+
+
+def test_cache(trace):
+    options = trace("Heuristic", jobs=300)
+    expected = irmasim.run(options, logs=True)
+    compiled = irmasim.run(dict(options, workload_cache=True), logs=True)
+    assert "Compiled workload" in compiled.output
+    cached = irmasim.run(dict(options, workload_cache=True), logs=True)
+    assert "Using compiled workload" in cached.output
+    for result in [compiled, cached]:
+        assert result.statistics == expected.statistics
+        assert result.logs == expected.logs
+    # A cache is only used with the file it was compiled from
+    with open(options["workload_file"]) as in_f:
+        jobs = json.load(in_f)["jobs"][:200]
+    with open(options["workload_file"], "w") as out_f:
+        json.dump({"jobs": jobs}, out_f)
+    changed = irmasim.run(dict(options, workload_cache=True))
+    assert "Compiled workload" in changed.output
+    assert changed.statistics == irmasim.run(options).statistics
+    assert changed.statistics["jobs"]["finished"] == 200